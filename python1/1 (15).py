@@ -1,41 +1,91 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-
-from decimal import Decimal, getcontext
-from fractions import Fraction
+"""
+binary_expansion.py
+
+Exact binary expansions of constants next to their IEEE 754 doubles.
+
+Each constant (a name or expression lazy_real understands: "pi", "1/e",
+"sqrt(3)", "pi**2/6", ...) is evaluated once, as floor(x 2^P) for the
+largest bit count asked for (constants.py / lazy_real.py, so every bit is
+certified); smaller bit counts are shifts of it. The double is the
+correctly rounded value of x taken from the same integer, and its exact
+fixed-point bits are its mantissa shifted into place. Rows carry both
+bitstrings and the first fractional bit where they differ, and go out as
+text, CSV or LaTeX table rows.
+
+Example:
+    rows = compare(["pi", "e", "1/pi", "1/e"], [53, 4096])
+    write_csv(rows, sys.stdout)
+    python binary_expansion.py pi e "sqrt(2)" --bits 64 --format latex
+"""
+import argparse
+import ast
+import csv
 import math
+import sys
+from fractions import Fraction
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple
 
-# High precision for greedy expansions
-getcontext().prec = 200
+from lazy_real import LazyReal, parse_real
+
+Row = Dict[str, object]
+FIELDS = ("name", "bits", "greedy", "ieee", "first_diff")
+DEFAULT_NAMES = ("pi", "e", "1/pi", "1/e")
+DOUBLE_BITS = 1076          # covers the midpoints between any two doubles
+TEX_NAMES = {"pi": "\\pi", "e": "e", "sqrt2": "\\sqrt{2}", "ln2": "\\ln 2"}
+TEX_ESCAPES = {c: "\\" + c for c in "#$%&_{}"}
+TEX_ESCAPES.update({"\\": "\\textbackslash{}", "^": "\\^{}", "~": "\\~{}"})
 
-# High-precision constants for greedy (not IEEE) computations
-PI_DEC = Decimal('3.14159265358979323846264338327950288419716939937510582097494459230781640628620899')
-E_DEC  = Decimal('2.71828182845904523536028747135266249775724709369995957496696762772407663035354759')
 
 def int_to_bin(n: int) -> str:
     """Binary without 0b prefix."""
     return format(n, 'b')
 
-def greedy_fixed_binary_decimal(x: Decimal, frac_bits: int) -> str:
+
+def fixed_value(name: str, frac_bits: int) -> int:
+    """floor(x * 2^frac_bits) for the constant or expression `name`, exactly."""
+    x = parse_real(name)
+    if isinstance(x, LazyReal):
+        value = x.fixed(frac_bits)
+    else:
+        value = (x.numerator << frac_bits) // x.denominator
+    if value < 0:
+        raise ValueError("Negative values not supported in this formatter for this use case.")
+    return value
+
+
+def fixed_to_double(value: int, frac_bits: int) -> float:
     """
-    Binary greedy expansion in fixed-point form (integer_part.frac_bits),
-    computed from Decimal with high precision.
+    The double nearest to any x in [value, value + 1) / 2^frac_bits, for an
+    irrational x and frac_bits >= DOUBLE_BITS: int / int rounds correctly,
+    and the odd numerator stands for the digits beyond frac_bits. An exact
+    x can sit on a tie, which this always rounds up; compare() uses
+    float(Fraction) for those.
     """
-    # Integer part
-    int_part = int(x)  # safe with positive inputs here
-    frac = x - Decimal(int_part)
-
-    # Fractional bits via greedy subtraction (equivalently multiply-by-2 method)
-    bits = []
-    for _ in range(frac_bits):
-        frac *= 2
-        if frac >= 1:
-            bits.append('1')
-            frac -= 1
-        else:
-            bits.append('0')
-
-    return f"{int_to_bin(int_part)}.{''.join(bits)}"
+    return (2 * value + 1) / (1 << (frac_bits + 1))
+
+
+def fixed_from_double(x: float, frac_bits: int) -> int:
+    """floor(x * 2^frac_bits) for a finite double x, by shifting its mantissa."""
+    mant, exp = math.frexp(x)
+    mant, shift = int(mant * (1 << 53)), exp - 53 + frac_bits
+    return mant << shift if shift >= 0 else mant >> -shift
+
+
+def fixed_string(value: int, frac_bits: int) -> str:
+    """value / 2^frac_bits as 'integer_part.frac_bits'."""
+    frac = format(value & ((1 << frac_bits) - 1), f"0{frac_bits}b") if frac_bits else ""
+    return f"{int_to_bin(value >> frac_bits)}.{frac}"
+
+
+def first_diff(a: int, b: int, frac_bits: int) -> Optional[int]:
+    """1-based index of the first fractional bit where a and b differ (0: integer part)."""
+    diff = a ^ b
+    if diff == 0:
+        return None
+    return max(frac_bits - diff.bit_length() + 1, 0)
+
 
 def float_to_exact_fraction(x: float) -> Fraction:
     """
@@ -44,6 +94,7 @@ def float_to_exact_fraction(x: float) -> Fraction:
     """
     return Fraction.from_float(x)
 
+
 def fixed_binary_from_fraction(fr: Fraction, frac_bits: int) -> str:
     """
     Render exact binary of a rational number as fixed-point with frac_bits bits.
@@ -51,65 +102,128 @@ def fixed_binary_from_fraction(fr: Fraction, frac_bits: int) -> str:
     """
     if fr < 0:
         raise ValueError("Negative values not supported in this formatter for this use case.")
+    return fixed_string((fr.numerator << frac_bits) // fr.denominator, frac_bits)
 
-    n, d = fr.numerator, fr.denominator
-    int_part = n // d
-    rem = n - int_part * d
-
-    # Integer bits
-    int_bits = int_to_bin(int_part)
-
-    # Fractional bits
-    bits = []
-    for _ in range(frac_bits):
-        rem *= 2
-        if rem >= d:
-            bits.append('1')
-            rem -= d
-        else:
-            bits.append('0')
-
-    return f"{int_bits}.{''.join(bits)}"
 
 def ieee754_double_fixed_binary(x: float, frac_bits: int = 53) -> str:
     """
     Fixed-point binary string of the exact IEEE 754 double value of x,
     showing exactly frac_bits bits after the point (padded if necessary).
     """
-    fr = float_to_exact_fraction(x)  # exact value of the binary64 float
-    return fixed_binary_from_fraction(fr, frac_bits)
-
-def main(frac_bits: int = 53):
-    # Greedy expansions (Decimal high precision)
-    greedy_pi   = greedy_fixed_binary_decimal(PI_DEC, frac_bits)
-    greedy_e    = greedy_fixed_binary_decimal(E_DEC, frac_bits)
-    greedy_inv_pi = greedy_fixed_binary_decimal(Decimal(1) / PI_DEC, frac_bits)
-    greedy_inv_e  = greedy_fixed_binary_decimal(Decimal(1) / E_DEC, frac_bits)
-
-    # IEEE 754 double (binary64) exact values rendered in fixed-point
-    ieee_pi     = ieee754_double_fixed_binary(math.pi, frac_bits)
-    ieee_e      = ieee754_double_fixed_binary(math.e, frac_bits)
-    ieee_inv_pi = ieee754_double_fixed_binary(1.0 / math.pi, frac_bits)
-    ieee_inv_e  = ieee754_double_fixed_binary(1.0 / math.e, frac_bits)
-
-    # Print results
-    print(f"Greedy π     : {greedy_pi}")
-    print(f"IEEE64 π     : {ieee_pi}")
-    print(f"Greedy e     : {greedy_e}")
-    print(f"IEEE64 e     : {ieee_e}")
-    print(f"Greedy 1/π   : {greedy_inv_pi}")
-    print(f"IEEE64 1/π   : {ieee_inv_pi}")
-    print(f"Greedy 1/e   : {greedy_inv_e}")
-    print(f"IEEE64 1/e   : {ieee_inv_e}")
-
-    # Optional: emit LaTeX table rows
-    def tex_row(name, greedy, ieee):
-        return f"${name}$ & \\texttt{{{greedy}}} & \\texttt{{{ieee}}} \\\\"
-    print("\n% LaTeX table rows:")
-    print(tex_row("\\pi", greedy_pi, ieee_pi))
-    print(tex_row("e", greedy_e, ieee_e))
-    print(tex_row("1/\\pi", greedy_inv_pi, ieee_inv_pi))
-    print(tex_row("1/e", greedy_inv_e, ieee_inv_e))
+    if x < 0:
+        raise ValueError("Negative values not supported in this formatter for this use case.")
+    return fixed_string(fixed_from_double(x, frac_bits), frac_bits)
+
+
+def compare(names: Iterable[str], bit_counts: Iterable[int]) -> List[Row]:
+    """One row per (constant, bit count): exact and IEEE bitstrings, first differing bit."""
+    bit_counts = sorted(set(bit_counts))
+    if not bit_counts or bit_counts[0] < 0:
+        raise ValueError("bit counts must be non-negative")
+    top = max(bit_counts[-1], DOUBLE_BITS)
+    rows: List[Row] = []
+    for name in names:
+        x = parse_real(name)
+        exact = fixed_value(name, top)
+        # a Fraction may be a tie between doubles; float() rounds it to even
+        double = float(x) if isinstance(x, Fraction) else fixed_to_double(exact, top)
+        for n in bit_counts:
+            greedy, ieee = exact >> (top - n), fixed_from_double(double, n)
+            rows.append({
+                "name": name,
+                "bits": n,
+                "greedy": fixed_string(greedy, n),
+                "ieee": fixed_string(ieee, n),
+                "first_diff": first_diff(greedy, ieee, n),
+            })
+    return rows
+
+
+def write_csv(rows: Iterable[Row], out: TextIO) -> None:
+    writer = csv.DictWriter(out, FIELDS)
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def _tex(node: ast.AST) -> Tuple[str, int]:
+    """(LaTeX, precedence) of an expression: 1 for + -, 2 for * /, 3 for **, 4 for atoms."""
+    def operand(child: ast.AST, least: int) -> str:
+        tex, prec = _tex(child)
+        return tex if prec >= least else f"\\left({tex}\\right)"
+
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return str(node.value), 4
+    if isinstance(node, ast.Name) and node.id in TEX_NAMES:
+        return TEX_NAMES[node.id], 4
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        sign = "-" if isinstance(node.op, ast.USub) else "+"
+        return sign + operand(node.operand, 2), 1
+    if isinstance(node, ast.BinOp):
+        if isinstance(node.op, ast.Add):
+            return f"{operand(node.left, 1)} + {operand(node.right, 1)}", 1
+        if isinstance(node.op, ast.Sub):
+            return f"{operand(node.left, 1)} - {operand(node.right, 2)}", 1
+        if isinstance(node.op, ast.Mult):
+            return f"{operand(node.left, 2)} \\cdot {operand(node.right, 2)}", 2
+        if isinstance(node.op, ast.Div):
+            return f"\\frac{{{_tex(node.left)[0]}}}{{{_tex(node.right)[0]}}}", 2
+        if isinstance(node.op, ast.Pow):
+            return f"{operand(node.left, 4)}^{{{_tex(node.right)[0]}}}", 3
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+            and node.func.id == "sqrt" and len(node.args) == 1 and not node.keywords):
+        return f"\\sqrt{{{_tex(node.args[0])[0]}}}", 4
+    raise ValueError(f"no LaTeX form for {ast.unparse(node)}")
+
+
+def tex_name(name: str) -> str:
+    """name as LaTeX math ("sqrt(2)/2" -> $\\frac{\\sqrt{2}}{2}$), else as \\texttt."""
+    try:
+        return f"${_tex(ast.parse(name.strip(), mode='eval').body)[0]}$"
+    except (SyntaxError, ValueError):
+        return "\\texttt{" + "".join(TEX_ESCAPES.get(c, c) for c in name) + "}"
+
+
+def write_latex(rows: Iterable[Row], out: TextIO) -> None:
+    """LaTeX table rows: name & greedy & IEEE & first differing bit."""
+    for row in rows:
+        diff = "--" if row["first_diff"] is None else row["first_diff"]
+        out.write(f"{tex_name(row['name'])} & \\texttt{{{row['greedy']}}} & "
+                  f"\\texttt{{{row['ieee']}}} & {diff} \\\\\n")
+
+
+def write_text(rows: Iterable[Row], out: TextIO) -> None:
+    for row in rows:
+        label = row["name"].replace("pi", "π")
+        out.write(f"Greedy {label:<6}: {row['greedy']}\n")
+        out.write(f"IEEE64 {label:<6}: {row['ieee']}\n")
+        if row["first_diff"] is not None:
+            out.write(f"{'':14}first differing bit: {row['first_diff']}\n")
+
+
+def main(frac_bits: int = 53, names: Iterable[str] = DEFAULT_NAMES, fmt: str = "text"):
+    rows = compare(names, [frac_bits])
+    if fmt == "csv":
+        write_csv(rows, sys.stdout)
+    elif fmt == "latex":
+        write_latex(rows, sys.stdout)
+    else:
+        write_text(rows, sys.stdout)
+        print("\n% LaTeX table rows:")
+        write_latex(rows, sys.stdout)
+
 
 if __name__ == "__main__":
-    main(frac_bits=53)
+    parser = argparse.ArgumentParser(
+        description="Exact binary expansions of constants beside their IEEE 754 doubles."
+    )
+    parser.add_argument("names", nargs="*", default=list(DEFAULT_NAMES),
+                        help="constants or expressions (default: pi e 1/pi 1/e)")
+    parser.add_argument("--bits", type=int, nargs="+", default=[53],
+                        help="fractional bits to show (default 53)")
+    parser.add_argument("--format", choices=("text", "csv", "latex"), default="text")
+    args = parser.parse_args()
+    if len(args.bits) == 1:
+        main(args.bits[0], args.names, args.format)
+    else:
+        rows = compare(args.names, args.bits)
+        {"csv": write_csv, "latex": write_latex, "text": write_text}[args.format](rows, sys.stdout)
@@ -1,6 +1,7 @@
-import math
 from typing import List
 
+from greedy_expansion import float_exponents
+
 def binary_exponents(x: float, n: int) -> List[int]:
     """
     Compute the first n exponents m_k in the expansion
@@ -13,6 +14,13 @@ def binary_exponents(x: float, n: int) -> List[int]:
         x: a float in (0, 1)
         n: number of exponents to produce (n >= 1)
     
+    A float is dyadic, so the m_k are read exactly off its mantissa bits
+    (float_exponents) instead of from math.log2 and float remainders,
+    which lose the thread after 52 bits and can go negative. The strict
+    2^{-m_k} < x_{k-1} makes this the non-terminating expansion: where the
+    float's bits end, its last exponent is one larger and every further
+    m_k is 1 (x_k = 1 from there on).
+
     Returns:
         A list of length n with the exponents [m1, m2, ..., mn].
     
@@ -24,18 +32,10 @@ def binary_exponents(x: float, n: int) -> List[int]:
     if n < 1:
         raise ValueError("n must be at least 1")
     
-    exponents: List[int] = []
-    x_k = x
-    
-    for _ in range(n):
-        # compute m_k so that 2^{-m_k} < x_k <= 2^{1-m_k}
-        m_k = math.floor(-math.log2(x_k)) + 1
-        
-        # update the “remainder” x_{k} -> x_{k+1}
-        x_k = (2 ** m_k) * x_k - 1
-        
-        exponents.append(m_k)
-    
+    exponents = float_exponents([x], n)[0]
+    if len(exponents) < n:
+        exponents[-1] += 1
+        exponents += [1] * (n - len(exponents))
     return exponents
 
 # Example usage:
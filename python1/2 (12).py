@@ -1,5 +1,8 @@
 from decimal import Decimal, getcontext
 
+from constants import dyadic
+from dyadic import to_decimal
+
 def required_bits_for_digits(d):
     """
     Estimate number of dyadic bits needed to get d correct decimal digits.
@@ -14,21 +17,12 @@ def dyadic_pi_bits(digits):
     """
     n_bits = required_bits_for_digits(digits)
     getcontext().prec = n_bits + 10  # extra precision
-    pi = Decimal('3.14159265358979323846264338327950288419716939937510')
-    frac = pi - int(pi)  # fractional part
-    bits = []
-    numerator = 0
+    d = dyadic("pi", n_bits)  # numerator = floor(π·2^n_bits) mod 2^n_bits
+    numerator, _ = d.as_pair()
     denominator = 1 << n_bits  # 2^n_bits
-    for i in range(1, n_bits + 1):
-        frac *= 2
-        if frac >= 1:
-            bits.append(1)
-            numerator += 1 << (n_bits - i)
-            frac -= 1
-        else:
-            bits.append(0)
-    dyadic_decimal = Decimal(numerator) / Decimal(denominator)
-    return bits, f"{numerator}/{denominator}", dyadic_decimal
+    # via Decimal: str(int) is quadratic (and capped at 4300 digits)
+    frac_str = f"{to_decimal(numerator)}/{to_decimal(denominator)}"
+    return list(d), frac_str, d.decimal()
 
 # Example usage
 if __name__ == "__main__":
@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 import math
 import sys
-from itertools import product
-from sympy import symbols, Poly, GF, rem
+from sympy import symbols
+
+from field_registry import minimal_irreducible
+from gf_field import GFField
+from gfp_poly import GFpPoly
 
 def is_prime_power(n):
     for p in range(2, int(math.isqrt(n)) + 2):
@@ -20,12 +23,9 @@ def is_prime_power(n):
     return None, None
 
 def find_irred_poly(p, k):
-    x = symbols('x')
-    for coeffs in product(range(p), repeat=k):
-        poly = Poly(x**k + sum(c*x**i for i,c in enumerate(coeffs)), x, domain=GF(p))
-        if poly.is_irreducible:
-            return poly
-    raise ValueError(f"No irreducible polynomial for GF({p}^{k})")
+    if k < 1:
+        raise ValueError(f"No irreducible polynomial for GF({p}^{k})")
+    return minimal_irreducible(p, k).to_sympy(symbols('x'))
 
 def build_field(p, k, irr_poly=None):
     # k=1: just F_p
@@ -38,29 +38,19 @@ def build_field(p, k, irr_poly=None):
             lambda a: str(a)
         )
 
-    x = symbols('x')
-    elems = list(product(range(p), repeat=k))
-
-    def to_poly(v):
-        return sum(coef * x**i for i, coef in enumerate(v))
-
-    def to_vec(poly):
-        remp = rem(Poly(poly, x, domain=GF(p)), irr_poly, domain=GF(p))
-        coeffs = [0]*k
-        for mon, c in zip(remp.monoms(), remp.coeffs()):
-            coeffs[mon[0]] = int(c)
-        return tuple(coeffs)
+    # integer-encoded field: add/mul are table lookups, not SymPy rem()
+    field = GFField(p, k, GFpPoly.from_sympy(irr_poly))
+    elems = field.product_order()
 
     def add(a, b):
-        return tuple((a[i] + b[i]) % p for i in range(k))
+        return int(field.add(a, b))
 
     def mul(a, b):
-        prod = Poly(to_poly(a) * to_poly(b), x, domain=GF(p))
-        return to_vec(prod)
+        return int(field.mul(a, b))
 
-    def fmt(v):
+    def fmt(a):
         terms = []
-        for i, c in enumerate(v):
+        for i, c in enumerate(field.coeffs(a).tolist()):
             if c:
                 if i == 0:
                     terms.append(f"{c}")
@@ -1,4 +1,8 @@
+import sys
 from fractions import Fraction
+from itertools import product
+
+from latex_tables import write_grid
 
 # 1) build Q17_nonzero = {k/8: k = -7..-1,1..7}
 Q17 = [Fraction(k, 8) for k in range(-8, 9)]
@@ -7,43 +11,39 @@ Q17_nonzero = [x for x in Q17 if x != 0]
 # 2) build R257_nonzero = all u+v*sqrt(1/8) with u,v != 0
 R257_nonzero = [(u, v) for u in Q17_nonzero for v in Q17_nonzero]
 
-# 3) build C65537 elements = zero + all (a,b) with a,b in R257_nonzero
-elements = [((0, 0), (0, 0))] + [
-    (a, b) for a in R257_nonzero for b in R257_nonzero
-]
+# 3) C65537 elements = zero + all (a,b) with a,b in R257_nonzero; the
+#    nonzero ones are generated lazily, never materialised as a list
+def frac(q):
+    return f"\\frac{{{q.numerator}}}{{{q.denominator}}}"
+
+# TeX for each of the 256 elements of R257_nonzero, formatted once
+R257_tex = {
+    (u, v): f"{frac(u)} + {frac(v)}\\,\\sqrt{{\\tfrac18}}"
+    for u, v in R257_nonzero
+}
+
+def nonzero_entries():
+    for a, b in product(R257_nonzero, R257_nonzero):
+        yield f"${R257_tex[a]} + ({R257_tex[b]})\\,i$"
 
 # 4) table parameters
 cols = 256
+out = sys.stdout
 
 # 5) print LaTeX tabular header
-print(r"\begin{tabular}{" + "|c" * cols + "|}")
-print(r"\hline")
-print(
+out.write(r"\begin{tabular}{" + "|c" * cols + "|}" + "\n")
+out.write(r"\hline" + "\n")
+out.write(
     r"\multicolumn{" + str(cols) +
-    r"}{|c|}{\bf Elements of \(C_{65537}\)} \\"
+    r"}{|c|}{\bf Elements of \(C_{65537}\)} \\" + "\n"
 )
-print(r"\hline")
+out.write(r"\hline" + "\n")
 
 # 6) the zero element on its own row
-print(r"\multicolumn{" + str(cols) + r"}{|c|}{$0$} \\ \hline")
-
-# 7) print all nonzero elements in 256-column rows
-for idx, ((u1, v1), (u2, v2)) in enumerate(elements[1:], start=1):
-    real_part = (
-        f"\\frac{{{u1.numerator}}}{{{u1.denominator}}}"
-        f" + \\frac{{{v1.numerator}}}{{{v1.denominator}}}"
-        f"\\,\\sqrt{{\\tfrac18}}"
-    )
-    imag_part = (
-        f"\\frac{{{u2.numerator}}}{{{u2.denominator}}}"
-        f" + \\frac{{{v2.numerator}}}{{{v2.denominator}}}"
-        f"\\,\\sqrt{{\\tfrac18}}"
-    )
-    entry = f"${real_part} + ({imag_part})\,i$"
-    if idx % cols:
-        print(entry, end=" & ")
-    else:
-        print(entry + r" \\ \hline")
+out.write(r"\multicolumn{" + str(cols) + r"}{|c|}{$0$} \\ \hline" + "\n")
+
+# 7) stream all nonzero elements in 256-column rows, written in blocks
+write_grid(out, nonzero_entries(), cols, sep=" & ", row_end=r" \\ \hline")
 
 # 8) close the environment
-print(r"\end{tabular}")
+out.write(r"\end{tabular}" + "\n")
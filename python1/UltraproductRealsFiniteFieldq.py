@@ -1,7 +1,8 @@
 from fractions import Fraction
-from sympy import primerange
 import math
 
+from legendre import prime_index, residues
+
 def legendre_symbol(a: int, p: int) -> int:
     """
     Compute the Legendre symbol (a|p):
@@ -22,22 +23,15 @@ def ultraproduct_sequence(r: float,
     """
     Return a dict mapping each prime p ≤ max_prime to the representative a_p ∈ F_p
     of the real number r, via its best rational approximation m/n with n ≤ max_denominator.
+    The inverses of n come from a vectorised extended Euclid (legendre.residues).
     """
     # 1) approximate r by a rational m/n
     frac = Fraction(r).limit_denominator(max_denominator)
     m, n = frac.numerator, frac.denominator
 
-    seq = {}
-    for p in primerange(2, max_prime + 1):
-        # if p divides n, n has no inverse mod p; choose a_p = 0
-        if n % p == 0:
-            a_p = 0
-        else:
-            inv_n = pow(n, p-2, p)       # n^(p-2) ≡ n^(-1) mod p
-            a_p = (m * inv_n) % p
-        seq[p] = a_p
-
-    return seq
+    # a_p = m n^-1 mod p for all primes at once (0 where p divides n)
+    primes = prime_index(max_prime)
+    return dict(zip(primes.tolist(), residues(m, n, primes).tolist()))
 
 # --- Example usage ---------------------------------------------------------
 
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+archimedes.py
+
+Archimedes' polygon bounds for pi, one doubling per step, as a
+generator, so a sequence of estimates costs one pass, not one rerun of
+the recurrence per estimate.
+
+With s = edge length of the inscribed N-gon in the unit circle and
+x = s^2, doubling N is
+
+    x' = 2 - 2 sqrt(1 - x/4)  =  x / (2 + sqrt(4 - x)).
+
+The left form subtracts two nearly equal numbers (x ~ 4^-k) and loses
+about 0.6 digits per step; the right form has no cancellation, so the
+relative rounding error stays at one ulp per step. Each step brackets pi
+by the inscribed and circumscribed half-perimeters
+
+    N s / 2  <  pi  <  N s / sqrt(4 - x),
+
+and hi - lo ~ pi^3 / N^2 gives the number of correct digits directly.
+
+Example:
+    for step, lo, hi in iter_bounds():              # floats
+        ...
+    step, value = archimedes_pi(100)                # Decimal, 100 places
+"""
+import math
+from decimal import Context, Decimal, localcontext
+from typing import Callable, Iterator, Tuple, TypeVar
+
+Number = TypeVar("Number", float, Decimal)
+
+
+def iter_polygons(edge_sq: Number = 2.0, sides: int = 4,
+                  sqrt: Callable[[Number], Number] = math.sqrt
+                  ) -> Iterator[Tuple[int, Number]]:
+    """Yield (N, s^2) for the inscribed N-gon, N = sides, 2 sides, ... forever."""
+    while True:
+        yield sides, edge_sq
+        edge_sq = edge_sq / (2 + sqrt(4 - edge_sq))
+        sides *= 2
+
+
+def iter_bounds(edge_sq: Number = 2.0, sides: int = 4,
+                sqrt: Callable[[Number], Number] = math.sqrt
+                ) -> Iterator[Tuple[int, Number, Number]]:
+    """Yield (step, lo, hi) with lo < pi < hi, starting from the square."""
+    for step, (n, x) in enumerate(iter_polygons(edge_sq, sides, sqrt)):
+        lo = n * sqrt(x) / 2
+        yield step, lo, 2 * lo / sqrt(4 - x)
+
+
+def guard_digits(places: int) -> int:
+    """Guard digits for `places`: one ulp per step, ~places / 0.6 steps."""
+    return len(str(places * 2 + 10)) + 2
+
+
+def iter_decimal(places: int) -> Iterator[Tuple[int, Decimal, Decimal]]:
+    """iter_bounds in Decimal at places + guard_digits(places) digits."""
+    # the working precision applies inside each step only, not to the caller
+    ctx = Context(prec=places + guard_digits(places))
+    bounds = iter_bounds(Decimal(2), 4, Decimal.sqrt)
+    while True:
+        with localcontext(ctx):
+            item = next(bounds)
+        yield item
+
+
+def digits(lo: Number, hi: Number) -> float:
+    """Decimal digits pinned down by the bracket [lo, hi]."""
+    width = hi - lo
+    return math.inf if width <= 0 else -float(Decimal(width).log10())
+
+
+def archimedes_pi(places: int) -> Tuple[int, Decimal]:
+    """(steps, pi) once hi - lo < 10^-places; pi is the midpoint, rounded to places digits."""
+    eps = Decimal(1).scaleb(-places)
+    for step, lo, hi in iter_decimal(places):
+        if hi - lo < eps:
+            with localcontext() as ctx:
+                ctx.prec = places
+                return step, +((lo + hi) / 2)
+    raise AssertionError("unreachable")
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    places = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    t0 = time.perf_counter()
+    step, value = archimedes_pi(places)
+    dt = time.perf_counter() - t0
+    print(f"{places} digits after {step} doublings ({dt:.2f} s): {str(value)[:50]}...")
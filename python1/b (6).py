@@ -1,22 +1,15 @@
-import math
+from constants import frac_bits
+from dyadic import DyadicBits
 
 def dyadic_pi(n):
     """
     Compute the first n dyadic bits of π using its fractional part.
     Returns: (bit list, dyadic value as float)
     """
-    pi = math.pi
-    frac = pi - int(pi)  # fractional part of π
-    bits = []
-    value = 0.0
-    for i in range(1, n+1):
-        frac *= 2
-        if frac >= 1:
-            bits.append(1)
-            value += 1 / (2**i)
-            frac -= 1
-        else:
-            bits.append(0)
+    # exact bits of π (math.pi only carries 53 bits, so n = 67 was wrong past ~50)
+    m = frac_bits("pi", n)
+    bits = list(DyadicBits(m, n))
+    value = m / (1 << n)
     return bits, value
 
 # Example usage
@@ -1,37 +1,34 @@
 from fractions import Fraction
 import math
+import sys
+
+from dyadic import dyadic_bits_of
+from leibniz import pi_q
 
 def leibniz_polyserie(p):
     """Compute π_p = 4 * sum_{k=0}^{p-1} (1/(4k+1) - 1/(4k+3)) as a Fraction."""
-    s = Fraction(0, 1)
-    for k in range(p):
-        s += Fraction(1, 4*k + 1) - Fraction(1, 4*k + 3)
-    return 4 * s  # polyserie version
+    return pi_q(p)  # polyserie version, resumed from the leibniz.py checkpoint
 
 def dyadic_bits(frac, n):
-    """Return first n dyadic bits of fractional part of frac (truncation)."""
-    f = frac - frac.numerator // frac.denominator  # fractional part
-    bits = []
-    value = Fraction(0, 1)
-    for i in range(1, n+1):
-        f *= 2
-        if f >= 1:
-            bits.append(1)
-            value += Fraction(1, 2**i)
-            f -= 1
-        else:
-            bits.append(0)
-    return bits, value
+    """
+    Return first n dyadic bits of fractional part of frac (truncation), as
+    a lazy dyadic.DyadicBits, and the dyadic value m / 2^n as (m, n).
+    """
+    bits = dyadic_bits_of(frac, n)  # (num << n) // den, one division
+    return bits, bits.as_pair()
 
 # Example usage
 if __name__ == "__main__":
     p = 79769       # prime index for polyserie
     n = 50000       # number of dyadic bits
 
+    if hasattr(sys, "set_int_max_str_digits"):
+        sys.set_int_max_str_digits(0)   # π_p is printed exactly below
     pi_p = leibniz_polyserie(p)
-    bits, val = dyadic_bits(pi_p, n)
+    bits, (m, _) = dyadic_bits(pi_p, n)
+    val = Fraction(m, 1 << n)
 
     print(f"Modular polyserie π_p for p = {p}:")
     print("π_p =", pi_p, "≈", float(pi_p))
-    print(f"Dyadic_{n} bits of fractional part:", bits)
+    print(f"Dyadic_{n} bits of fractional part:", list(bits))
     print("Dyadic value =", val, "≈", float(val))
@@ -1,90 +1,17 @@
 ﻿#!/usr/bin/env python3
+import argparse
+import os
 import sys
-import math
+from contextlib import nullcontext
 from fractions import Fraction
-from typing import List, Tuple, Union
+from typing import Dict, Tuple, Union
 
-# Safe names for eval’ing expressions like "pi/4" or "e-2"
-_ALLOWED_NAMES = {
-    'pi': math.pi,
-    'e':  math.e
-}
+from dyadic import to_decimal
+from greedy_expansion import (binary_exponents, exponent_summary, exps_to_bitstring,
+                              iter_records, parse_x, partial_binary_sum, write_records)
+from lazy_real import LazyReal
 
-def parse_x(raw_x: str) -> Fraction:
-    """
-    Parse raw_x as one of:
-      - "a/b"           (Fraction)
-      - float literal  (e.g. "0.625")
-      - math expression (e.g. "pi/4", "e-2")
-    Return its Fraction in (0,1), reducing to the fractional part if ≥1.
-    """
-    try:
-        x = Fraction(raw_x)
-    except ValueError:
-        try:
-            val = eval(raw_x, {"__builtins__": None}, _ALLOWED_NAMES)
-            x = Fraction(val).limit_denominator()
-        except Exception:
-            raise ValueError(f"could not parse x = {raw_x!r}")
-    if x >= 1:
-        x -= x.numerator // x.denominator
-    if not (0 < x < 1):
-        raise ValueError("x must lie strictly between 0 and 1 after fractional part")
-    return x
-
-def binary_exponents(x: Fraction, n: int) -> List[int]:
-    """
-    Compute up to n greedy-binary exponents m_k for x.
-    Stops early if the remainder becomes zero.
-    """
-    if n < 1:
-        raise ValueError("n must be at least 1")
-
-    exps: List[int] = []
-    rem = x
-
-    for _ in range(n):
-        if rem == 0:
-            break
-        inv = Fraction(1, 1) / rem
-        p, q = inv.numerator, inv.denominator
-
-        # floor(log2(inv)) via bit lengths
-        bits_p, bits_q = p.bit_length(), q.bit_length()
-        candidate = bits_p - bits_q
-        floor_log2 = candidate - 1 if p < (q << candidate) else candidate
-
-        # ceil(log2(inv))
-        m = floor_log2 if p == (q << floor_log2) else floor_log2 + 1
-
-        rem = rem * (1 << m) - 1
-        exps.append(m)
-
-    return exps
-
-def partial_binary_sum(exps: List[int]) -> Fraction:
-    """
-    Given exponents [m1, m2, …], compute
-      sum_{k=1..len(exps)} 2^{-(m1+…+mk)}.
-    """
-    total, cum = Fraction(0), 0
-    for m in exps:
-        cum += m
-        total += Fraction(1, 1 << cum)
-    return total
-
-def exps_to_bitstring(exps: List[int]) -> str:
-    """
-    Build the binary bitstring (after "0.") by placing a '1'
-    then (m_k–1) zeros for each exponent m_k.
-    """
-    bits: List[str] = []
-    for m in exps:
-        bits.append('1')
-        bits.extend('0' * (m - 1))
-    return ''.join(bits)
-
-def prompt_inputs() -> Tuple[Fraction, int]:
+def prompt_inputs() -> Tuple[Union[Fraction, LazyReal], int]:
     print("This program calculates the greedy binary expansion of x ∈ (0,1).")
     raw_x = input("Enter x (e.g. 0.625, 5/8, pi/4): ").strip()
     raw_n = input("Enter n (positive integer): ").strip()
@@ -95,12 +22,61 @@ def prompt_inputs() -> Tuple[Fraction, int]:
         raise ValueError(f"n must be an integer (you gave {raw_n!r})")
     return x, n
 
+def print_summary(summary: Dict[str, object]) -> None:
+    print(f"inputs: {summary['inputs']}   errors: {summary['errors']}   "
+          f"terminated early: {summary['terminated']}")
+    for title, key in (("exponent m_k", "exponents"), ("largest m_k per input", "largest")):
+        hist = summary[key]
+        total = sum(hist.values())
+        print(f"\n{title:>22}  {'count':>10}  {'share':>8}")
+        for m, count in hist.items():
+            print(f"{m:>22}  {count:>10}  {count / total:>8.4f}")
+
+def run_batch(args: argparse.Namespace) -> None:
+    """x values one per line from a file or stdin -> records or a summary."""
+    source = nullcontext(sys.stdin) if args.batch == "-" else open(args.batch, encoding="utf-8")
+    with source as lines:
+        records = iter_records(lines, args.terms, args.workers)
+        if args.summary:
+            print_summary(exponent_summary(records))
+            return
+        out = (nullcontext(sys.stdout) if args.output is None
+               else open(args.output, "w", newline="", encoding="utf-8"))
+        with out as f:
+            write_records(records, f, args.format)
+
 def main():
-    if len(sys.argv) == 3:
-        raw_x, raw_n = sys.argv[1], sys.argv[2]
+    parser = argparse.ArgumentParser(
+        description="Greedy binary expansion of x in (0,1): one x n pair, "
+                    "the interactive prompt, or a --batch of x values."
+    )
+    parser.add_argument("x", nargs="?", help="x, e.g. 0.625, 5/8, pi/4")
+    parser.add_argument("n", nargs="?", help="number of exponents")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="read x values one per line from FILE ('-' for stdin)")
+    parser.add_argument("--terms", type=int, default=64, metavar="N",
+                        help="exponents per x in batch mode (default 64)")
+    parser.add_argument("--format", choices=("jsonl", "csv", "tsv"), default="jsonl",
+                        help="batch output format (default jsonl)")
+    parser.add_argument("-o", "--output", help="batch output file (default stdout)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes for batch mode")
+    parser.add_argument("--summary", action="store_true",
+                        help="print exponent histograms instead of the records")
+    args = parser.parse_args()
+
+    if args.batch is not None:
         try:
-            x = parse_x(raw_x)
-            n = int(raw_n)
+            run_batch(args)
+        except (OSError, ValueError) as e:
+            print("Error:", e)
+            sys.exit(1)
+        return
+
+    if args.x is not None and args.n is not None:
+        try:
+            x = parse_x(args.x)
+            n = int(args.n)
         except Exception as e:
             print("Error:", e)
             sys.exit(1)
@@ -111,7 +87,11 @@ def main():
             print("Error:", e)
             sys.exit(1)
 
-    exps = binary_exponents(x, n)
+    try:
+        exps = binary_exponents(x, n)
+    except Exception as e:
+        print("Error:", e)
+        sys.exit(1)
     if len(exps) < n:
         print(f"\nnote: exact binary expansion terminated after {len(exps)} "
               f"term{'s' if len(exps) != 1 else ''}.")
@@ -122,7 +102,9 @@ def main():
     print()
     print(f"Input x = {x}   n = {n}")
     print(f"The first {len(exps)} exponents are: {exps}")
-    print(f"Binary approximation = {approx}   (≈ {float(approx)})")
+    # to_decimal: str() of a Fraction fails past 4300 digits
+    print(f"Binary approximation = {to_decimal(approx.numerator)}/"
+          f"{to_decimal(approx.denominator)}   (≈ {float(approx)})")
     print(f"Exact bits   = 0.{bitstr}")
 
 if __name__ == "__main__":
@@ -1,37 +1,15 @@
 # find_minimal_Q.py
 # Find minimal Q >= p such that dyadic_n(pi_q) stabilizes for q in [Q, Q_bound]
 # where pi_q = 4 * sum_{k=0}^{q-1} (1/(4k+1) - 1/(4k+3))
-# Uses Fraction for exact arithmetic.
+# pi_q increases with q, so stability on [Q, Q_bound] follows from the two
+# end values alone and Q_min is found by galloping + bisection
+# (stabilization.py); each value is exact or certified, never a float guess.
 
-from fractions import Fraction
 import math
 import sys
 
-def pi_q(q):
-    """Exact rational pi_q = 4 * sum_{k=0}^{q-1} (1/(4k+1) - 1/(4k+3))."""
-    s = Fraction(0, 1)
-    for k in range(q):
-        s += Fraction(1, 4*k+1) - Fraction(1, 4*k+3)
-    return 4 * s
-
-def fractional_part(frac):
-    """Fraction in [0,1) representing fractional part."""
-    return frac - (frac.numerator // frac.denominator)
-
-def dyadic_bits_of_fraction(frac, n):
-    """Return tuple of n bits (b1..bn) and Fraction dyadic value."""
-    f = fractional_part(frac)
-    bits = []
-    val = Fraction(0, 1)
-    for i in range(1, n+1):
-        f *= 2
-        if f >= 1:
-            bits.append(1)
-            val += Fraction(1, 2**i)
-            f -= 1
-        else:
-            bits.append(0)
-    return tuple(bits), val
+from leibniz import pi_q
+from stabilization import EXACT_LIMIT, find_q_min, pi_q_dyadic, pi_q_float
 
 def compute_Q_bound(n):
     """
@@ -46,32 +24,18 @@ def compute_Q_bound(n):
 def find_minimal_Q(p, n, max_search=None):
     """
     Find minimal Q >= p such that dyadic_n(pi_q) is constant for q in [Q, Q_bound].
-    Returns (Q_min, Q_bound, bits_at_Q).
+    Returns (Q_min, Q_bound, bits_at_Q), bits_at_Q a dyadic.DyadicBits.
     If no Q found before max_search (if provided) or before Q_bound, returns None.
     """
     Q_bound = compute_Q_bound(n)
     if max_search is not None:
         Q_bound = min(Q_bound, max_search)
 
-    # Precompute dyadic bits for q = p..Q_bound
-    bits_dict = {}
-    for q in range(p, Q_bound+1):
-        bits, _ = dyadic_bits_of_fraction(pi_q(q), n)
-        bits_dict[q] = bits
-
-    # Find minimal Q such that bits[q] equal for all q in [Q, Q_bound]
-    for Q in range(p, Q_bound+1):
-        target = bits_dict[Q]
-        stable = True
-        for q in range(Q, Q_bound+1):
-            if bits_dict[q] != target:
-                stable = False
-                break
-        if stable:
-            return Q, Q_bound, target
-
-    # If not found
-    return None
+    # O(log Q_bound) evaluations of pi_q instead of every q in [p, Q_bound]
+    Q = find_q_min(p, n, Q_bound)
+    if Q is None:
+        return None
+    return Q, Q_bound, pi_q_dyadic(Q, n)
 
 def main():
     if len(sys.argv) < 3:
@@ -91,13 +55,15 @@ def main():
 
     Q_min, Q_bound, bits = result
     # compute dyadic value and representative pi values
-    bits_val = sum(b * Fraction(1, 2**(i+1)) for i, b in enumerate(bits))
-    pi_Q = pi_q(Q_min)
+    bits_val = bits.fraction()
     print(f"Found Q_min = {Q_min}, stability guaranteed up to Q_bound = {Q_bound}.")
-    print(f"dyadic_{n} bits = {bits}")
+    print(f"dyadic_{n} bits = {tuple(bits)}")
     print(f"dyadic value = {bits_val} ≈ {float(bits_val)}")
-    print(f"pi_Q (exact) = {pi_Q}")
-    print(f"pi_Q (decimal) ≈ {float(pi_Q)}")
+    if Q_min <= EXACT_LIMIT:
+        print(f"pi_Q (exact) = {pi_q(Q_min)}")
+    else:
+        print(f"pi_Q (exact) not expanded for Q_min > {EXACT_LIMIT}")
+    print(f"pi_Q (decimal) ≈ {pi_q_float(Q_min)}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+dyadic.py
+
+First n dyadic (binary) digits of the fractional part of num/den, by one
+big-integer division:
+
+    m = ((num mod den) << n) // den,    frac(num/den) = m / 2^n + O(2^-n),
+
+so b_1 ... b_n are the n-bit binary digits of m (b_1 most significant),
+and the truncated dyadic value is the pair (m, n). Replaces the per-bit
+Fraction doubling loops of the dyadic-stability scripts.
+
+Example:
+    bits = dyadic_bits(355, 113, 16)
+    bits.as_pair()         # (9279, 16): frac(355/113) ≈ 9279 / 2^16
+    tuple(bits)            # (0, 0, 1, 0, 0, 1, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1)
+    bits.tobytes()         # b'$?'
+    bits.decimal()         # Decimal('0.1415863037109375'), exact
+"""
+from decimal import MAX_EMAX, MAX_PREC, MIN_EMIN, Context, Decimal
+from fractions import Fraction
+from functools import lru_cache
+from typing import Iterator, Tuple
+
+# exact Decimal arithmetic: nothing is ever rounded
+EXACT = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+
+@lru_cache(maxsize=None)
+def _pow2(k: int) -> Decimal:
+    return EXACT.power(Decimal(2), k)
+
+
+def to_decimal(x: int) -> Decimal:
+    """
+    Decimal(x) for a non-negative int, split in halves and recombined with
+    libmpdec's fast multiplication; Decimal(x) itself is quadratic
+    (~3 s for a 10^6-bit x, against ~0.2 s this way).
+    """
+    bits = x.bit_length()
+    if bits <= 1 << 12:
+        return Decimal(x)
+    h = bits // 2
+    return EXACT.add(EXACT.multiply(to_decimal(x >> h), _pow2(h)),
+                     to_decimal(x & ((1 << h) - 1)))
+
+
+class DyadicBits:
+    """Lazy view of b_1 .. b_n stored as the integer m = sum b_i 2^(n-i)."""
+
+    __slots__ = ("value", "n")
+
+    def __init__(self, value: int, n: int):
+        self.value, self.n = value, n
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, i: int) -> int:
+        if i < 0:
+            i += self.n
+        if not 0 <= i < self.n:
+            raise IndexError("dyadic bit index out of range")
+        return (self.value >> (self.n - 1 - i)) & 1
+
+    def __iter__(self) -> Iterator[int]:
+        return map(int, self.bitstring())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, DyadicBits):
+            return (self.value, self.n) == (other.value, other.n)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.value, self.n))
+
+    def __repr__(self) -> str:
+        return f"DyadicBits(0b{self.bitstring()}, {self.n})" if self.n else "DyadicBits(0, 0)"
+
+    def bitstring(self) -> str:
+        """'b_1 b_2 ... b_n' as a string of 0s and 1s."""
+        return format(self.value, f"0{self.n}b") if self.n else ""
+
+    def tobytes(self) -> bytes:
+        """Bits packed MSB-first, b_1 the top bit of byte 0, zero-padded."""
+        pad = -self.n % 8
+        return (self.value << pad).to_bytes((self.n + pad) // 8, "big")
+
+    __bytes__ = tobytes
+
+    def as_pair(self) -> Tuple[int, int]:
+        """The truncated dyadic value m / 2^n as (m, n)."""
+        return self.value, self.n
+
+    def fraction(self) -> Fraction:
+        """
+        m / 2^n as a reduced Fraction (for display). Fraction's gcd is
+        quadratic, seconds at 10^6 bits; as_pair() and decimal() are not.
+        """
+        return Fraction(self.value, 1 << self.n)
+
+    def decimal(self) -> Decimal:
+        """m / 2^n as an exact Decimal, m 5^n / 10^n without trailing zeros."""
+        m, n = self.value, self.n
+        if m == 0:
+            return Decimal(0)
+        t = min((m & -m).bit_length() - 1, n)      # cancel common powers of 2
+        m, n = m >> t, n - t
+        scaled = EXACT.multiply(to_decimal(m), EXACT.power(Decimal(5), n))
+        return scaled.scaleb(-n, context=EXACT)
+
+
+def dyadic_bits(num: int, den: int, n: int) -> DyadicBits:
+    """First n binary digits of the fractional part of num/den (den > 0)."""
+    return DyadicBits(((num % den) << n) // den, n)
+
+
+def dyadic_bits_of(x: Fraction, n: int) -> DyadicBits:
+    """dyadic_bits for a Fraction (or int)."""
+    x = Fraction(x)
+    return dyadic_bits(x.numerator, x.denominator, n)
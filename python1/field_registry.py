@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+field_registry.py
+
+Registry of the lexicographically minimal monic irreducible and primitive
+polynomials of degree n over GF(p), keyed by (p, n).
+
+Lookups go through three layers:
+  1. field_registry.json next to this file (shipped, covers every
+     GF(p^n) with n >= 2 and p^n < 10^6),
+  2. an on-disk cache (FIELD_REGISTRY_CACHE, default
+     ~/.cache/myfiles/field_registry.json) holding anything found later,
+  3. the fast search in gfp_poly, whose result is written to the cache.
+
+"Minimal" means first in the itertools.product(range(p), repeat=n) order
+on (a_0, ..., a_{n-1}) that the generate_finite_field_irreducibles*.py
+scripts always used, so every script sees the same polynomial for GF(p^n).
+Degree 1 is answered directly (x, resp. x - g with g = p - a_0 for the
+least admissible a_0, i.e. the largest primitive root g) and never stored.
+
+Usage:
+    python field_registry.py MAX_Q            # list fields of order < MAX_Q
+    python field_registry.py --build MAX_Q    # regenerate the shipped JSON
+"""
+import json
+import os
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from gfp_poly import GFpPoly, find_irreducible, find_primitive
+from poly_degree import prime_factors
+
+SHIPPED_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "field_registry.json")
+CACHE_PATH = os.environ.get(
+    "FIELD_REGISTRY_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "myfiles",
+                 "field_registry.json"))
+
+_SEARCH = {"irreducible": find_irreducible, "primitive": find_primitive}
+
+# kind -> "p,n" -> coefficients a_0, ..., a_n
+_tables: Dict[str, Dict[str, List[int]]] = {}
+_cached: Dict[str, Dict[str, List[int]]] = {}
+
+
+def _read(path: str) -> Dict[str, Dict[str, List[int]]]:
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write(path: str, data: Dict[str, Dict[str, List[int]]]):
+    """Atomically replace path with data; an unwritable cache is not an error."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, sort_keys=True, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def _load():
+    if _tables:
+        return
+    for kind in _SEARCH:
+        _tables[kind] = {}
+        _cached[kind] = {}
+    for source, into in ((_read(SHIPPED_PATH), None), (_read(CACHE_PATH), _cached)):
+        for kind, entries in source.items():
+            if kind in _tables:
+                _tables[kind].update(entries)
+                if into is not None:
+                    into[kind].update(entries)
+
+
+def _degree_one(kind: str, p: int) -> GFpPoly:
+    """x for "irreducible"; otherwise x + a_0 for the least a_0 with -a_0 a primitive root."""
+    if kind == "irreducible":
+        return GFpPoly._wrap(np.array([0, 1], dtype=np.int64), p)
+    if p == 2:
+        return GFpPoly._wrap(np.array([1, 1], dtype=np.int64), p)
+    cofactors = [(p - 1) // q for q in prime_factors(p - 1)]
+    a0 = next(a for a in range(1, p)
+              if all(pow(p - a, c, p) != 1 for c in cofactors))
+    return GFpPoly._wrap(np.array([a0, 1], dtype=np.int64), p)
+
+
+def _lookup(kind: str, p: int, n: int) -> GFpPoly:
+    if n == 1:
+        return _degree_one(kind, p)
+    _load()
+    key = f"{p},{n}"
+    coeffs = _tables[kind].get(key)
+    if coeffs is None:
+        f = _SEARCH[kind](p, n)
+        coeffs = f.coeffs()
+        _tables[kind][key] = coeffs
+        _cached[kind][key] = coeffs
+        _write(CACHE_PATH, _cached)
+    return GFpPoly(coeffs, p)
+
+
+def minimal_irreducible(p: int, n: int) -> GFpPoly:
+    """Lexicographically minimal monic irreducible polynomial of degree n over GF(p)."""
+    return _lookup("irreducible", p, n)
+
+
+def minimal_primitive(p: int, n: int) -> GFpPoly:
+    """Lexicographically minimal monic primitive polynomial of degree n over GF(p)."""
+    return _lookup("primitive", p, n)
+
+
+def _primes_below(m: int) -> List[int]:
+    sieve = bytearray([1]) * max(m, 2)
+    sieve[0] = sieve[1] = 0
+    for i in range(2, int(m ** 0.5) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytearray(len(range(i * i, m, i)))
+    return [i for i in range(m) if sieve[i]]
+
+
+def prime_powers_below(max_q: int) -> List[Tuple[int, int, int]]:
+    """All (q, p, n) with p prime, n >= 1 and q = p^n < max_q, sorted by q."""
+    out = []
+    for p in _primes_below(max_q):
+        q, n = p, 1
+        while q < max_q:
+            out.append((q, p, n))
+            q, n = q * p, n + 1
+    out.sort()
+    return out
+
+
+def list_fields(max_q: int, kind: str = "irreducible") -> List[Tuple[int, int, int, GFpPoly]]:
+    """
+    Every finite field GF(p^n) of order < max_q with its minimal defining
+    polynomial of the given kind ("irreducible" or "primitive"), as
+    (q, p, n, f) sorted by q.
+    """
+    return [(q, p, n, _lookup(kind, p, n)) for q, p, n in prime_powers_below(max_q)]
+
+
+def build(max_q: int, path: str = SHIPPED_PATH):
+    """Search every (p, n) with n >= 2, p^n < max_q and write the shipped table."""
+    data: Dict[str, Dict[str, List[int]]] = {kind: {} for kind in _SEARCH}
+    for q, p, n in prime_powers_below(max_q):
+        if n == 1:
+            continue
+        for kind, search in _SEARCH.items():
+            data[kind][f"{p},{n}"] = search(p, n).coeffs()
+    _write(path, data)
+    _tables.clear()
+    _cached.clear()
+
+
+def main():
+    args = sys.argv[1:]
+    if len(args) == 2 and args[0] == "--build" and args[1].isdigit():
+        build(int(args[1]))
+        print(f"Wrote {SHIPPED_PATH}")
+        return
+    if len(args) != 1 or not args[0].isdigit():
+        print("Usage: python field_registry.py [--build] MAX_Q")
+        sys.exit(1)
+    for q, p, n, f in list_fields(int(args[0])):
+        print(f"{q:>7} | {p:>6} | {n:>2} | {f} | {minimal_primitive(p, n)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,22 +5,16 @@ monic irreducible polynomial of degree n over GF(p).
 """
 
 import sys
-from itertools import product
 
 import sympy as sp
 from sympy import Poly
 from sympy.abc import x
 
+from field_registry import minimal_irreducible
+
 def find_irreducible_polynomial(p: int, n: int) -> Poly:
-    # Try all coefficient‐tuples (a_{n-1},…,a_0) in GF(p)
-    for coeffs in product(range(p), repeat=n):
-        expr = x**n
-        for i, a in enumerate(coeffs):
-            expr += a * x**i
-        poly = Poly(expr, x, modulus=p)
-        if poly.is_irreducible:
-            return poly
-    return None
+    # Shared registry lookup (native search on a miss); converted to SymPy
+    return minimal_irreducible(p, n).to_sympy(x)
 
 def main():
     try:
@@ -1,24 +1,18 @@
 #!/usr/bin/env python3
 import sys
-from itertools import product
 from typing import Optional      # ← add this
 import sympy as sp
 from sympy import Poly
 from sympy.abc import x
 
+from field_registry import minimal_irreducible
+
 def find_irreducible_poly(p: int, n: int) -> Optional[Poly]:   # ← use Optional[Poly]
     """
     Search for the lexicographically smallest monic irreducible
     polynomial of degree exactly n over GF(p). Returns a Poly or None.
     """
-    for coeffs in product(range(p), repeat=n):
-        expr = x**n
-        for i, a in enumerate(coeffs):
-            expr += a * x**i
-        poly = Poly(expr, x, modulus=p)
-        if poly.is_irreducible:
-            return poly
-    return None
+    return minimal_irreducible(p, n).to_sympy(x)
 
 def format_defining_relation(poly: Poly, p: int) -> str:
     n = poly.degree()
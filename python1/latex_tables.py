@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+latex_tables.py
+
+Streaming LaTeX emitters for large Cayley tables and element listings.
+
+A table is produced block by block: `op` is called on a block of row
+elements against one tile of column elements (NumPy broadcasting), the
+block is formatted and written, and nothing larger than one block is ever
+held in memory. Wide tables can be tiled into several `tabular` chunks
+(tile_cols / tile_rows) or emitted as a single `longtable` that LaTeX
+breaks across pages itself.
+
+Example:
+    F = GFField(3, 6)
+    label = label_lookup([str(i) for i in range(F.q)])
+    with open_tex("mul_table.tex") as out:
+        write_cayley_table(out, F.mul, np.arange(F.q), label, r"$\\times$",
+                           tile_cols=27, longtable=True)
+"""
+import io
+from typing import Callable, Iterable, Optional, Sequence, TextIO
+
+import numpy as np
+
+BUFFER_SIZE = 1 << 20
+
+Labeler = Callable[[np.ndarray], Sequence[str]]
+
+
+def open_tex(path: str) -> TextIO:
+    """Open path for writing through a large (1 MiB) write buffer."""
+    return open(path, "w", encoding="utf-8", buffering=BUFFER_SIZE)
+
+
+def label_lookup(labels: Sequence[str]) -> Labeler:
+    """Labeler that maps element codes to labels[code] in one gather."""
+    table = np.asarray(labels, dtype=object)
+    return table.__getitem__
+
+
+def _tiles(items: np.ndarray, size: Optional[int]):
+    if not size:
+        yield items
+        return
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def write_table(out: TextIO, op: Callable, rows, cols, label: Labeler, *,
+                row_label: Optional[Labeler] = None, corner: str = "",
+                first_col: str = "c", colspec: str = "c",
+                rule: str = r" \hline", caption: Optional[str] = None,
+                block_rows: int = 64, tile_cols: Optional[int] = None,
+                tile_rows: Optional[int] = None, longtable: bool = False):
+    """
+    Write the table op(r, c) for r in rows, c in cols.
+
+    op is called as op(row_block[:, None], col_tile[None, :]) and must
+    return an array of element codes, which `label` turns into cell text
+    (row_label, default `label`, does the same for the leading column and
+    header row). `rule` follows the header's line break, e.g. r" \\hline"
+    or "\\n\\\\midrule". With tile_cols each group of columns becomes its own
+    table; with tile_rows (tabular only) each group of rows does.
+    """
+    rows, cols = np.asarray(rows), np.asarray(cols)
+    row_label = row_label or label
+    env = "longtable" if longtable else "tabular"
+    boxed = caption is not None and not longtable
+    pad, cell_pad = ("  ", "    ") if boxed else ("", "")
+    for col_tile in _tiles(cols, tile_cols):
+        header = (f"{cell_pad}{corner} & " + " & ".join(row_label(col_tile))
+                  + f" \\\\{rule}\n")
+        for row_tile in _tiles(rows, None if longtable else tile_rows):
+            if boxed:
+                out.write("\\begin{table}[ht]\n  \\centering\n"
+                          f"  \\caption{{{caption}}}\n")
+            out.write(f"{pad}\\begin{{{env}}}{{{first_col}|{colspec * len(col_tile)}}}\n")
+            if longtable and caption is not None:
+                out.write(f"\\caption{{{caption}}} \\\\\n")
+            out.write(header)
+            if longtable:
+                out.write("\\endhead\n")
+            for start in range(0, len(row_tile), block_rows):
+                block = row_tile[start:start + block_rows]
+                result = op(block[:, None], col_tile[None, :])
+                out.write("".join(
+                    f"{cell_pad}{name} & " + " & ".join(label(line)) + " \\\\\n"
+                    for name, line in zip(row_label(block), result)))
+            out.write(f"{pad}\\end{{{env}}}\n")
+            if boxed:
+                out.write("\\end{table}\n")
+
+
+def write_cayley_table(out: TextIO, op: Callable, elements, label: Labeler,
+                       symbol: str, **kwargs):
+    """Square table of op over `elements`, with `symbol` in the corner cell."""
+    write_table(out, op, elements, elements, label, corner=symbol, **kwargs)
+
+
+def write_grid(out: TextIO, entries: Iterable[str], cols: int, *,
+               sep: str = " & ", row_end: str = r" \\ \hline",
+               block_rows: int = 16):
+    """
+    Lay out a stream of cell strings `cols` to a row, writing every
+    block_rows rows at once. A short last row is closed like the others.
+    """
+    buf = io.StringIO()
+    row, nrows = [], 0
+    for entry in entries:
+        row.append(entry)
+        if len(row) == cols:
+            buf.write(sep.join(row) + row_end + "\n")
+            row, nrows = [], nrows + 1
+            if nrows % block_rows == 0:
+                out.write(buf.getvalue())
+                buf = io.StringIO()
+    if row:
+        buf.write(sep.join(row) + row_end + "\n")
+    out.write(buf.getvalue())
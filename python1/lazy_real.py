@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+lazy_real.py
+
+Real numbers typed as expressions ("pi/4", "e - 2", "sqrt(2) - 1",
+"pi**2 / 10"), kept exact: nothing is evaluated until a precision is
+asked for, and then to exactly that precision.
+
+At precision p every node of the expression evaluates to an integer
+interval [lo, hi] with lo / 2^p <= value <= hi / 2^p: constants come
+from constants.fixed (floor(c 2^p) and one more), rationals are rounded
+outwards, and + - * / ** sqrt round their results outwards too. fixed(n)
+then evaluates at n + guard bits and returns floor(x 2^n) once both ends
+of the interval agree on it, doubling the guard otherwise. Expressions
+without a named constant or sqrt are just evaluated as a Fraction, and
+multiplying or dividing by one is an exact rescale; other divisions use
+constants' Newton division, so 10^6-bit evaluations stay fast.
+
+Example:
+    x = parse_real("pi/4")            # LazyReal
+    x.fixed(64)                       # floor(pi/4 * 2^64), exact
+    parse_real("3/8 + 1/4")           # Fraction(5, 8)
+"""
+import ast
+from fractions import Fraction
+from math import isqrt
+from typing import Callable, Tuple, Union
+
+import constants
+
+Interval = Tuple[int, int]
+
+# identifiers allowed in expressions -> constants.CONSTANTS keys
+NAMES = {"pi": "pi", "e": "e", "sqrt2": "sqrt2", "ln2": "ln2"}
+FUNCTIONS = {"sqrt"}
+MAX_GUARD = 1 << 16
+
+
+class LazyReal:
+    """A real x given by interval(p) -> [lo, hi] with lo <= x 2^p <= hi."""
+
+    __slots__ = ("text", "_interval")
+
+    def __init__(self, text: str, interval: Callable[[int], Interval]):
+        self.text, self._interval = text, interval
+
+    def interval(self, p: int) -> Interval:
+        return self._interval(p)
+
+    def fixed(self, bits: int) -> int:
+        """floor(x * 2^bits), exactly."""
+        guard = 32
+        while guard <= MAX_GUARD:
+            lo, hi = self._interval(bits + guard)
+            if lo >> guard == hi >> guard:
+                return lo >> guard
+            guard *= 2
+        raise ValueError(f"cannot pin down floor({self.text} * 2^{bits}); "
+                         f"is it a dyadic rational?")
+
+    def floor(self) -> int:
+        return self.fixed(0)
+
+    def __sub__(self, k: int) -> "LazyReal":
+        """x - k for an integer k."""
+        if not isinstance(k, int):
+            return NotImplemented
+        interval = self._interval
+        return LazyReal(f"{self.text} - {k}" if k else self.text,
+                        lambda p: tuple(v - (k << p) for v in interval(p)))
+
+    def __float__(self) -> float:
+        return self.fixed(64) / 2 ** 64
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return f"LazyReal({self.text!r})"
+
+
+# ── interval arithmetic at scale 2^p ──────────────────────────────────
+def _rational(q: Fraction, p: int) -> Interval:
+    a, b = q.numerator << p, q.denominator
+    return a // b, -(-a // b)
+
+
+def _mul(x: Interval, y: Interval, p: int) -> Interval:
+    products = [u * v for u in x for v in y]
+    return min(products) >> p, -(-max(products) >> p)
+
+
+def _floor_div(a: int, b: int) -> int:
+    """a // b, via constants' Newton division (long division is quadratic)."""
+    if b < 0:
+        a, b = -a, -b
+    q = constants._divide(a, b, max(a.bit_length() - b.bit_length(), 0) + 1)
+    r = a - q * b
+    while r < 0:
+        q, r = q - 1, r + b
+    while r >= b:
+        q, r = q + 1, r - b
+    return q
+
+
+def _div(x: Interval, y: Interval, p: int) -> Interval:
+    if y[0] <= 0 <= y[1]:
+        raise ZeroDivisionError("divisor interval contains 0")
+    if y[0] < 0:
+        x, y = (-x[1], -x[0]), (-y[1], -y[0])
+    # y > 0: the ends of x / y are x[0] and x[1] over whichever end of y
+    lo = _floor_div(x[0] << p, y[1] if x[0] >= 0 else y[0])
+    hi = -_floor_div(-x[1] << p, y[0] if x[1] >= 0 else y[1])
+    return lo, hi
+
+
+def _scale(x: Interval, q: Fraction) -> Interval:
+    """x * q for an exact q; its denominator is small, so // is cheap."""
+    ends = (x[0] * q.numerator, x[1] * q.numerator)
+    return min(ends) // q.denominator, -(-max(ends) // q.denominator)
+
+
+def _pow(x: Interval, k: int, p: int) -> Interval:
+    result = (1 << p, 1 << p)
+    for _ in range(abs(k)):
+        result = _mul(result, x, p)
+    return _div((1 << p, 1 << p), result, p) if k < 0 else result
+
+
+def _sqrt(x: Interval, p: int) -> Interval:
+    if x[0] < 0:
+        raise ValueError("sqrt of a negative number")
+    return isqrt(x[0] << p), isqrt(x[1] << p) + 1
+
+
+def _int_exponent(node: ast.AST) -> int:
+    value = _exact(node)
+    if value.denominator != 1:
+        raise ValueError("only integer exponents are supported")
+    return int(value)
+
+
+def _eval(node: ast.AST, p: int) -> Interval:
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return _rational(Fraction(str(node.value)), p)
+    if isinstance(node, ast.Name) and node.id in NAMES:
+        f = constants.fixed(NAMES[node.id], p)
+        return f, f + 1
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        lo, hi = _eval(node.operand, p)
+        return (-hi, -lo) if isinstance(node.op, ast.USub) else (lo, hi)
+    if isinstance(node, ast.BinOp):
+        if isinstance(node.op, ast.Pow):
+            return _pow(_eval(node.left, p), _int_exponent(node.right), p)
+        if isinstance(node.op, (ast.Mult, ast.Div)) and _is_exact(node.right):
+            q = _exact(node.right)
+            return _scale(_eval(node.left, p), q if isinstance(node.op, ast.Mult) else 1 / q)
+        if isinstance(node.op, ast.Mult) and _is_exact(node.left):
+            return _scale(_eval(node.right, p), _exact(node.left))
+        x, y = _eval(node.left, p), _eval(node.right, p)
+        if isinstance(node.op, ast.Add):
+            return x[0] + y[0], x[1] + y[1]
+        if isinstance(node.op, ast.Sub):
+            return x[0] - y[1], x[1] - y[0]
+        if isinstance(node.op, ast.Mult):
+            return _mul(x, y, p)
+        if isinstance(node.op, ast.Div):
+            return _div(x, y, p)
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+            and node.func.id == "sqrt" and len(node.args) == 1 and not node.keywords):
+        return _sqrt(_eval(node.args[0], p), p)
+    raise ValueError(f"unsupported expression: {ast.unparse(node)}")
+
+
+def _exact(node: ast.AST) -> Fraction:
+    """Value of a constant-free expression."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return Fraction(str(node.value))
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        value = _exact(node.operand)
+        return -value if isinstance(node.op, ast.USub) else value
+    if isinstance(node, ast.BinOp):
+        x = _exact(node.left)
+        if isinstance(node.op, ast.Pow):
+            return x ** _int_exponent(node.right)
+        y = _exact(node.right)
+        if isinstance(node.op, ast.Add):
+            return x + y
+        if isinstance(node.op, ast.Sub):
+            return x - y
+        if isinstance(node.op, ast.Mult):
+            return x * y
+        if isinstance(node.op, ast.Div):
+            return x / y
+    raise ValueError(f"unsupported expression: {ast.unparse(node)}")
+
+
+def _is_exact(node: ast.AST) -> bool:
+    return not any(isinstance(n, (ast.Name, ast.Call)) for n in ast.walk(node))
+
+
+def parse_real(text: str) -> Union[Fraction, LazyReal]:
+    """A Fraction if text is rational arithmetic, else a LazyReal."""
+    node = ast.parse(text.strip(), mode="eval").body
+    if _is_exact(node):
+        return _exact(node)
+    for n in ast.walk(node):
+        if isinstance(n, ast.Name) and n.id not in NAMES.keys() | FUNCTIONS:
+            raise ValueError(f"unknown name {n.id!r}")
+    _eval(node, 8)                     # reject unsupported syntax up front
+    return LazyReal(text.strip(), lambda p: _eval(node, p))
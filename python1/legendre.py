@@ -0,0 +1,138 @@
+"""
+legendre.py
+
+Legendre symbols (m n^-1 | p) of a rational m/n at every prime p up to a
+bound, vectorised over NumPy blocks of primes.
+
+n^-1 is n times the square (n^-1)^2, so (m n^-1 | p) = (m | p)(n | p): no
+inverse and no pow(a, (p - 1)/2, p) per prime. Each factor is a Jacobi
+symbol, found for a whole array at once by the binary-GCD-style rules:
+strip the factors of 2 of a (flipping the sign if p = 3, 5 mod 8 and an
+odd number were stripped), swap a and p by reciprocity (flipping if both
+are 3 mod 4), reduce, and repeat until a = 0; about log p rounds with no
+exponentiation. The primes come from a segmented sieve one block at a
+time, so memory stays at a block plus the result, an int8 array of
+symbols aligned with the array of primes. The 5.08 * 10^7 primes below
+10^9 take about a minute.
+
+Example:
+    primes, symbols = legendre_symbols(Fraction(2, 3), 10 ** 6)
+    symbols[np.searchsorted(primes, 7)]        # (2 * 3^-1 | 7) = -1
+    residues(2, 3, primes)                     # 2 * 3^-1 mod p, per prime
+"""
+from fractions import Fraction
+from math import isqrt
+from typing import Iterator, Tuple, Union
+
+import numpy as np
+
+SEGMENT = 1 << 22               # sieve block (numbers, not primes)
+MAX_PRIME = 1 << 31             # residue products must fit in int64
+LIMB = 30
+
+
+def small_primes(limit: int) -> np.ndarray:
+    """Primes <= limit as int64, from a plain sieve of Eratosthenes."""
+    sieve = np.ones(limit + 1, dtype=bool)
+    sieve[:2] = False
+    for i in range(2, isqrt(limit) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = False
+    return np.flatnonzero(sieve).astype(np.int64)
+
+
+def iter_prime_blocks(limit: int, segment: int = SEGMENT) -> Iterator[np.ndarray]:
+    """Primes <= limit in increasing int64 blocks, from a segmented sieve."""
+    if limit >= MAX_PRIME:
+        raise ValueError(f"limit must be below {MAX_PRIME}")
+    base = small_primes(isqrt(limit))
+    for lo in range(2, limit + 1, segment):
+        hi = min(lo + segment, limit + 1)
+        seg = np.ones(hi - lo, dtype=bool)
+        for q in base:
+            q = int(q)
+            if q * q >= hi:
+                break
+            seg[max(q * q, -(-lo // q) * q) - lo::q] = False
+        yield np.flatnonzero(seg).astype(np.int64) + lo
+
+
+def prime_index(limit: int) -> np.ndarray:
+    """All primes <= limit, in the dtype legendre_symbols aligns its symbols with."""
+    blocks = list(iter_prime_blocks(limit))
+    return np.concatenate(blocks).astype(np.int32) if blocks else np.empty(0, np.int32)
+
+
+def mod_primes(m: int, primes: np.ndarray) -> np.ndarray:
+    """m mod p for every p (< 2^32) and any Python int m, by 30-bit limbs."""
+    negative, m = m < 0, abs(m)
+    r = np.zeros(primes.shape, dtype=np.int64)
+    for shift in range(LIMB * (m.bit_length() // LIMB), -1, -LIMB):
+        r = ((r << LIMB) + ((m >> shift) & ((1 << LIMB) - 1))) % primes
+    return (primes - r) % primes if negative else r
+
+
+def jacobi(a: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Jacobi symbols (a | n) as int8, for int64 arrays a >= 0 and odd n > 0."""
+    a = np.asarray(a, dtype=np.int64) % n
+    n = np.array(n, dtype=np.int64)
+    sign = np.ones(a.shape, dtype=np.int8)
+    active = np.flatnonzero(a)
+    while active.size:
+        x, y = a[active], n[active]
+        low = x & -x
+        twos = np.log2(low).astype(np.int64)         # exact for powers of 2
+        x >>= twos
+        y8 = y & 7
+        flip = ((twos & 1) == 1) & ((y8 == 3) | (y8 == 5))
+        flip ^= ((x & 3) == 3) & ((y & 3) == 3)
+        sign[active[flip]] *= -1
+        x, y = y % x, x
+        a[active], n[active] = x, y
+        active = active[x != 0]
+    return np.where(n == 1, sign, 0).astype(np.int8)
+
+
+def _block_symbols(m: int, n: int, primes: np.ndarray) -> np.ndarray:
+    odd = np.where(primes == 2, 1, primes)           # (a | 1) = 1; p = 2 set below
+    symbols = jacobi(mod_primes(m, odd), odd) * jacobi(mod_primes(n, odd), odd)
+    symbols[primes == 2] = m % 2 * (n % 2)           # a_2 = m mod 2, as pow() gave
+    return symbols.astype(np.int8)
+
+
+def legendre_symbols(x: Union[Fraction, int], limit: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (primes, symbols): every prime p <= limit and the int8 symbol of the
+    residue of x = m/n mod p, 0 where p divides m or n.
+    """
+    x = Fraction(x)
+    m, n = x.numerator, x.denominator
+    primes, symbols = [], []
+    for block in iter_prime_blocks(limit):
+        primes.append(block.astype(np.int32))
+        symbols.append(_block_symbols(m, n, block))
+    if not primes:
+        return np.empty(0, np.int32), np.empty(0, np.int8)
+    return np.concatenate(primes), np.concatenate(symbols)
+
+
+def inverse_mod(a: np.ndarray, p: np.ndarray) -> np.ndarray:
+    """a^-1 mod p elementwise (0 where p divides a), by the extended Euclidean algorithm."""
+    a = np.asarray(a, dtype=np.int64) % p
+    r0, r1 = np.array(p, dtype=np.int64), a.copy()
+    t0, t1 = np.zeros_like(a), np.ones_like(a)
+    active = np.flatnonzero(r1)
+    while active.size:
+        x0, x1 = r0[active], r1[active]
+        q = x0 // x1
+        r0[active], r1[active] = x1, x0 - q * x1
+        u0, u1 = t0[active], t1[active]
+        t0[active], t1[active] = u1, u0 - q * u1
+        active = active[r1[active] != 0]
+    return np.where(a == 0, 0, t0 % p)
+
+
+def residues(m: int, n: int, primes: np.ndarray) -> np.ndarray:
+    """m n^-1 mod p for every prime p, 0 where p divides n."""
+    primes = np.asarray(primes, dtype=np.int64)
+    return mod_primes(m, primes) * inverse_mod(mod_primes(n, primes), primes) % primes
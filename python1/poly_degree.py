@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 # Python 3.8 compatible
 
-from math import sqrt
+import random
+import sys
+from math import gcd
+from multiprocessing import Pool, cpu_count
 
 def degree(poly):
     """Return degree of polynomial (highest bit index)."""
@@ -20,57 +23,233 @@ def poly_mul(a, b):
 def poly_mod(num, mod_poly):
     """Compute num(x) mod mod_poly(x) over GF(2)."""
     dm = degree(mod_poly)
-    while degree(num) >= dm:
-        shift = degree(num) - dm
-        num ^= (mod_poly << shift)
+    dn = degree(num)
+    while dn >= dm:
+        num ^= (mod_poly << (dn - dm))
+        dn = degree(num)
     return num
 
-def is_irreducible(poly):
-    """Check if poly is irreducible over GF(2) via Rabin’s test."""
+def poly_mulmod(a, b, mod_poly):
+    """Compute a(x)*b(x) mod mod_poly(x) over GF(2)."""
+    return poly_mod(poly_mul(a, b), mod_poly)
+
+def poly_powmod(base, e, mod_poly):
+    """Compute base(x)^e mod mod_poly(x) over GF(2) by square-and-multiply."""
+    result = 1
+    base = poly_mod(base, mod_poly)
+    while e:
+        if e & 1:
+            result = poly_mulmod(result, base, mod_poly)
+        base = poly_mulmod(base, base, mod_poly)
+        e >>= 1
+    return result
+
+def poly_gcd(a, b):
+    """Greatest common divisor of two polynomials over GF(2)."""
+    while b:
+        a, b = b, poly_mod(a, b)
+    return a
+
+def reciprocal(poly):
+    """Return the reciprocal x^d * f(1/x), i.e. the bit-reversed polynomial."""
     d = degree(poly)
-    # x^(2^i) mod poly minus x should be non-zero for all 1 <= i <= d//2
-    test = 2  # represents x
-    for i in range(1, d // 2 + 1):
-        test = poly_mod(poly_mul(test, test), poly)
-        if poly_mod(test ^ 2, poly) == 0:
+    return int(format(poly, f"0{d + 1}b")[::-1], 2)
+
+def _is_probable_prime(n):
+    """Deterministic Miller-Rabin for n < 3.3e24, probabilistic beyond."""
+    if n < 2:
+        return False
+    small = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+    for p in small:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in small:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
             return False
     return True
 
-def is_primitive(poly):
-    """Check if irreducible poly is primitive: x is a generator of GF(2^d)*."""
-    if not is_irreducible(poly):
-        return False
-    d = degree(poly)
-    order = (1 << d) - 1  # 2^d - 1
-    # factor order and ensure x^(order / p) != 1 for each prime p dividing order
-    n = order
+def _pollard_brent(n):
+    """Return a non-trivial factor of the odd composite n."""
+    while True:
+        y, c, m = random.randrange(1, n), random.randrange(1, n), 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+def prime_factors(n):
+    """Return the set of distinct prime factors of n."""
     primes = set()
-    # simple factorization
     p = 2
-    while p * p <= n:
+    while p < 1000 and p * p <= n:
         if n % p == 0:
             primes.add(p)
             while n % p == 0:
                 n //= p
         p += 1
-    if n > 1:
-        primes.add(n)
-    # test generator property
-    for p in primes:
-        if poly_mod(pow(2, order // p, poly), poly) == 1:
+    stack = [n] if n > 1 else []
+    while stack:
+        m = stack.pop()
+        if _is_probable_prime(m):
+            primes.add(m)
+        else:
+            f = _pollard_brent(m)
+            stack.extend((f, m // f))
+    return primes
+
+def _has_full_order(poly, d, order, cofactors):
+    """True if x has multiplicative order exactly 2^d - 1 modulo poly."""
+    # x^(2^d) == x  <=>  x^order == 1, since x is a unit mod poly
+    t = 2
+    for _ in range(d):
+        t = poly_mulmod(t, t, poly)
+    if t != poly_mod(2, poly):
+        return False
+    for c in cofactors:
+        if poly_powmod(2, c, poly) == 1:
+            return False
+    return True
+
+def is_irreducible(poly):
+    """Check if poly is irreducible over GF(2) via Rabin’s test."""
+    d = degree(poly)
+    if d < 1:
+        return False
+    # x^(2^d) == x mod poly, and gcd(x^(2^(d/q)) - x, poly) == 1 for q | d
+    x_pow = {}
+    test = 2  # represents x
+    for i in range(1, d + 1):
+        test = poly_mulmod(test, test, poly)
+        x_pow[i] = test
+    if x_pow[d] != poly_mod(2, poly):
+        return False
+    for q in prime_factors(d):
+        if poly_gcd(poly, x_pow[d // q] ^ 2) != 1:
             return False
     return True
 
-def primitive_polys(deg):
-    """Return all primitive polynomials of exact degree `deg` over GF(2)."""
-    results = []
-    # iterate over monic polynomials of degree `deg`
-    start = 1 << deg
-    end = 1 << (deg + 1)
-    for poly in range(start + 1, end, 2):  # skip even (must have constant term 1)
-        if is_primitive(poly):
-            results.append(poly)
-    return results
+def is_primitive(poly):
+    """Check if irreducible poly is primitive: x is a generator of GF(2^d)*."""
+    d = degree(poly)
+    if d < 1 or not poly & 1:
+        return False
+    order = (1 << d) - 1  # 2^d - 1
+    cofactors = [order // p for p in prime_factors(order)]
+    return _has_full_order(poly, d, order, cofactors)
+
+def num_primitive_polys(deg):
+    """Number of primitive polynomials of degree deg over GF(2): φ(2^d − 1)/d."""
+    order = (1 << deg) - 1
+    phi = order
+    for p in prime_factors(order):
+        phi -= phi // p
+    return phi // deg
+
+def _scan_shard(args):
+    """
+    Worker: test candidates x^d + (m << 1) + 1 for m in [lo, hi).
+
+    Only odd-weight candidates are tested (even weight means x + 1 divides
+    them) and only the smaller member of each reciprocal pair; the partner
+    is reported alongside it. Returns the list found, or its length when
+    count_only is set.
+    """
+    deg, lo, hi, cofactors, count_only = args
+    order = (1 << deg) - 1
+    top = 1 << deg
+    found = []
+    count = 0
+    for m in range(lo, hi):
+        poly = top | (m << 1) | 1
+        if deg > 1 and bin(poly).count("1") % 2 == 0:
+            continue
+        rev = reciprocal(poly)
+        if rev < poly:
+            continue
+        if not _has_full_order(poly, deg, order, cofactors):
+            continue
+        if count_only:
+            count += 1 if rev == poly else 2
+        else:
+            found.append(poly)
+            if rev != poly:
+                found.append(rev)
+    return count if count_only else found
+
+def _shards(deg, cofactors, count_only, shard_size):
+    """Split the 2^(deg-1) odd candidates into [lo, hi) shard descriptors."""
+    total = 1 << (deg - 1)
+    for lo in range(0, total, shard_size):
+        yield (deg, lo, min(lo + shard_size, total), cofactors, count_only)
+
+def iter_primitive_polys(deg, workers=None, shard_size=1 << 12, count_only=False):
+    """
+    Lazily yield the primitive polynomials of degree `deg` over GF(2).
+
+    2^deg - 1 is factored once up front. Shards of the candidate space are
+    scanned by a process pool of `workers` processes (default: all cores;
+    1 scans in-process) and results are yielded in completion order, not
+    sorted. With count_only=True one per-shard count is yielded instead.
+    """
+    if deg < 1:
+        raise ValueError("deg must be at least 1")
+    order = (1 << deg) - 1
+    cofactors = [order // p for p in prime_factors(order)]
+    shards = _shards(deg, cofactors, count_only, shard_size)
+    if workers is None:
+        workers = cpu_count()
+    if workers <= 1 or deg < 12:
+        results = map(_scan_shard, shards)
+        for res in results:
+            yield from ([res] if count_only else res)
+        return
+    with Pool(workers) as pool:
+        for res in pool.imap_unordered(_scan_shard, shards):
+            yield from ([res] if count_only else res)
+
+def primitive_polys(deg, workers=None, count_only=False):
+    """
+    Return all primitive polynomials of exact degree `deg` over GF(2),
+    sorted ascending. With count_only=True return just their number,
+    checked against φ(2^d − 1)/d.
+    """
+    if count_only:
+        count = sum(iter_primitive_polys(deg, workers, count_only=True))
+        expected = num_primitive_polys(deg)
+        if count != expected:
+            raise ArithmeticError(
+                f"degree {deg}: found {count} primitive polynomials, "
+                f"expected φ(2^d − 1)/d = {expected}")
+        return count
+    return sorted(iter_primitive_polys(deg, workers))
 
 def poly_to_str(poly):
     """Pretty-print a polynomial integer as e.g. x^4 + x + 1."""
@@ -85,8 +264,19 @@ def poly_to_str(poly):
                 terms.append(f"x^{i}")
     return " + ".join(terms) or "0"
 
-# Example usage
+# Example usage:
+#   python poly_degree.py            -> list primitives of degree 1..5
+#   python poly_degree.py 24 --count -> count degree-24 primitives in parallel
 if __name__ == "__main__":
+    if len(sys.argv) >= 2:
+        d = int(sys.argv[1])
+        if "--count" in sys.argv[2:]:
+            n = primitive_polys(d, count_only=True)
+            print(f"Degree {d}: {n} primitive polynomials (= φ(2^{d} − 1)/{d})")
+        else:
+            for p in iter_primitive_polys(d):
+                print(poly_to_str(p))
+        sys.exit(0)
     for d in range(1, 6):
         prims = primitive_polys(d)
         print(f"Degree {d} primitives:")
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+stabilization.py
+
+Q_min search for the dyadic stabilisation of the Leibniz partial sums
+
+    pi_q = 4 * sum_{k=0}^{q-1} (1/(4k+1) - 1/(4k+3)).
+
+Grouped in pairs the terms are positive, so pi_q increases with q.
+Together with the next odd partial sum this brackets pi:
+
+    pi_q  <  pi  <  pi_q + 4/(4q+1).
+
+F(x) = floor(x * 2^n) is monotone, so the first n bits (and the integer
+part) are constant on [q1, q2] as soon as F(pi_q1) == F(pi_q2). Only the
+two envelope values are needed, never the values in between. Hence "bits
+stable on [Q, Q_bound]" is monotone in Q, and galloping from p followed
+by bisection finds Q_min in O(log Q_min) evaluations.
+
+For q <= EXACT_LIMIT an evaluation is exact (leibniz.pi_q_pair). Beyond
+that it uses pi_q = pi + psi(q + 1/4) - psi(q + 3/4) in mpmath, raising
+the precision until floor(pi_q * 2^n) is certain. pi_q is a rational
+with odd denominator, so it never lands on a dyadic boundary and the loop
+ends. This makes n = 64 (Q_min ~ 10^20) a matter of milliseconds.
+
+Two more facts let a batch of (p, n) pairs share work (SharedFloors):
+the least admissible Q >= p is max(p, Q*) with Q* the least Q >= 1,
+and Q* never decreases with n (n + 1 stable bits give n stable bits).
+
+Example:
+    Q = find_q_min(97, 32)                   # stable from Q on, forever
+    bits = pi_q_dyadic(Q, 32)                # dyadic.DyadicBits
+    find_q_min(23, 8, q_bound=2000)          # stable on [Q, 2000]
+"""
+from typing import Callable, Dict, Optional
+
+import mpmath
+
+from dyadic import DyadicBits
+from leibniz import pi_q_pair
+
+EXACT_LIMIT = 1 << 12
+
+Floor = Callable[[int, int], int]
+
+
+def _certified_floor(value: Callable[[], "mpmath.mpf"], n: int, bits: int) -> int:
+    """floor(value() * 2^n) for a value known not to be a dyadic rational."""
+    guard = 32
+    while True:
+        with mpmath.workprec(n + bits + guard):
+            x = mpmath.ldexp(value(), n)
+            f = mpmath.floor(x)
+            eps = mpmath.ldexp(1, -(guard // 2))
+            if x - f > eps and f + 1 - x > eps:
+                return int(f)
+        guard *= 2
+
+
+def pi_q_mpf(q: int) -> "mpmath.mpf":
+    """pi_q at the current mpmath precision (digamma form)."""
+    return (mpmath.pi + mpmath.digamma(q + mpmath.mpf(0.25))
+            - mpmath.digamma(q + mpmath.mpf(0.75)))
+
+
+def pi_q_floor(q: int, n: int) -> int:
+    """floor(pi_q * 2^n), exactly."""
+    if q <= EXACT_LIMIT:
+        num, den = pi_q_pair(q)
+        return (num << n) // den
+    return _certified_floor(lambda: pi_q_mpf(q), n, 2 * q.bit_length())
+
+
+def pi_q_float(q: int) -> float:
+    """pi_q rounded to a float (for display)."""
+    if q <= EXACT_LIMIT:
+        num, den = pi_q_pair(q)
+        return num / den
+    with mpmath.workprec(64 + 2 * q.bit_length()):
+        return float(pi_q_mpf(q))
+
+
+def pi_q_dyadic(q: int, n: int, floor: Floor = pi_q_floor) -> DyadicBits:
+    """First n dyadic bits of the fractional part of pi_q."""
+    return DyadicBits(floor(q, n) & ((1 << n) - 1), n)
+
+
+class SharedFloors:
+    """
+    Memoised floor(pi_q * 2^n) for every n <= max_n: each q is evaluated
+    once at max_n and shifted down, since floor(floor(x 2^N) / 2^(N-n))
+    = floor(x 2^n). Pass it as `floor` to share evaluations across n.
+    """
+
+    def __init__(self, max_n: int):
+        self.max_n = max_n
+        self._memo: Dict[int, int] = {}
+
+    def __call__(self, q: int, n: int) -> int:
+        if n > self.max_n:
+            return pi_q_floor(q, n)
+        f = self._memo.get(q)
+        if f is None:
+            f = self._memo[q] = pi_q_floor(q, self.max_n)
+        return f >> (self.max_n - n)
+
+
+def pi_floor(n: int) -> int:
+    """floor(pi * 2^n)."""
+    return _certified_floor(lambda: mpmath.pi, n, 0)
+
+
+def stable_between(q1: int, q2: int, n: int) -> bool:
+    """True if pi_q has the same first n bits for every q in [q1, q2]."""
+    return pi_q_floor(q1, n) == pi_q_floor(q2, n)
+
+
+def stable_forever(q: int, n: int) -> bool:
+    """True if the first n bits of pi_q are already those of pi (and so of every pi_t, t >= q)."""
+    return pi_q_floor(q, n) == pi_floor(n)
+
+
+def find_q_min(p: int, n: int, q_bound: Optional[int] = None,
+               floor: Floor = pi_q_floor) -> Optional[int]:
+    """
+    Least Q >= p such that the first n bits of pi_q agree for all q in
+    [Q, q_bound], or for all q >= Q when q_bound is None. None if p > q_bound.
+    `floor(q, n)` evaluates floor(pi_q 2^n) (e.g. a SharedFloors).
+    """
+    if q_bound is not None and p > q_bound:
+        return None
+    target = pi_floor(n) if q_bound is None else floor(q_bound, n)
+    if floor(p, n) == target:
+        return p
+    # gallop: lo always fails, hi (once found) succeeds
+    lo, step = p, 1
+    while True:
+        hi = lo + step
+        if q_bound is not None and hi >= q_bound:
+            hi = q_bound
+            break
+        if floor(hi, n) == target:
+            break
+        lo, step = hi, 2 * step
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if floor(mid, n) == target:
+            hi = mid
+        else:
+            lo = mid
+    return hi
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    p = int(sys.argv[1]) if len(sys.argv) > 1 else 97
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    t0 = time.perf_counter()
+    Q = find_q_min(p, n)
+    dt = time.perf_counter() - t0
+    print(f"p = {p}, n = {n}: Q_min = {Q}, bits = {pi_q_dyadic(Q, n).bitstring()} "
+          f"({dt * 1000:.1f} ms)")
@@ -1,24 +1,15 @@
 from decimal import Decimal, getcontext
 
+from constants import dyadic
+
 def dyadic_pi_bits(n_bits):
     """
     Compute first n_bits of dyadic expansion of π's fractional part.
     Returns: (bit list, dyadic value as Decimal)
     """
-    getcontext().prec = n_bits + 10  # extra precision to avoid rounding errors
-    pi = Decimal('3.1415926535897932384626433832795028841971')  # or use math.pi with lower precision
-    frac = pi - int(pi)  # fractional part
-    bits = []
-    value = Decimal(0)
-    for i in range(1, n_bits + 1):
-        frac *= 2
-        if frac >= 1:
-            bits.append(1)
-            value += Decimal(1) / (2 ** i)
-            frac -= 1
-        else:
-            bits.append(0)
-    return bits, value
+    getcontext().prec = n_bits + 10  # enough for the caller's 3 + value
+    d = dyadic("pi", n_bits)  # all bits from floor(π·2^n_bits), one big int
+    return list(d), d.decimal()
 
 def main():
     n_bits = 35  # enough to get 10 correct decimal digits
@@ -1,62 +1,13 @@
 ﻿#!/usr/bin/env python3
 import sys
-import math
 from fractions import Fraction
-from typing import List, Tuple, Union
+from typing import Tuple, Union
 
-_ALLOWED_NAMES = {
-    'pi': math.pi,
-    'e': math.e
-}
+from dyadic import to_decimal
+from greedy_expansion import binary_exponents, exps_to_bitstring, parse_x, partial_binary_sum
+from lazy_real import LazyReal
 
-def parse_x(raw_x: str) -> Fraction:
-    try:
-        x = Fraction(raw_x)
-    except ValueError:
-        try:
-            val = eval(raw_x, {"__builtins__": None}, _ALLOWED_NAMES)
-            x = Fraction(val).limit_denominator()
-        except Exception:
-            raise ValueError(f"could not parse x = {raw_x!r}")
-    if x >= 1:
-        x -= x.numerator // x.denominator
-    if not (0 < x < 1):
-        raise ValueError("x must lie strictly between 0 and 1 after fractional part")
-    return x
-
-def binary_exponents(x: Fraction, n: int) -> List[int]:
-    if n < 1:
-        raise ValueError("n must be at least 1")
-    exps: List[int] = []
-    rem = x
-    for _ in range(n):
-        if rem == 0:
-            break
-        inv = Fraction(1, 1) / rem
-        p, q = inv.numerator, inv.denominator
-        bits_p, bits_q = p.bit_length(), q.bit_length()
-        candidate = bits_p - bits_q
-        floor_log2 = candidate - 1 if p < (q << candidate) else candidate
-        m = floor_log2 if p == (q << floor_log2) else floor_log2 + 1
-        rem = rem * (1 << m) - 1
-        exps.append(m)
-    return exps
-
-def partial_binary_sum(exps: List[int]) -> Fraction:
-    total, cum = Fraction(0), 0
-    for m in exps:
-        cum += m
-        total += Fraction(1, 1 << cum)
-    return total
-
-def exps_to_bitstring(exps: List[int]) -> str:
-    bits: List[str] = []
-    for m in exps:
-        bits.append('1')
-        bits.extend('0' * (m - 1))
-    return ''.join(bits)
-
-def prompt_inputs() -> Tuple[Fraction, int]:
+def prompt_inputs() -> Tuple[Union[Fraction, LazyReal], int]:
     print("This program calculates the greedy binary expansion of x in (0,1).")
     raw_x = input("Enter x (e.g. 0.625, 5/8, pi/4): ").strip()
     raw_n = input("Enter n (positive integer): ").strip()
@@ -82,7 +33,11 @@ def main():
         except Exception as e:
             print("Error:", e)
             sys.exit(1)
-    exps = binary_exponents(x, n)
+    try:
+        exps = binary_exponents(x, n)
+    except Exception as e:
+        print("Error:", e)
+        sys.exit(1)
     if len(exps) < n:
         print(f"\nnote: exact binary expansion terminated after {len(exps)} term{'s' if len(exps) != 1 else ''}.")
     approx = partial_binary_sum(exps)
@@ -90,7 +45,9 @@ def main():
     print()
     print(f"Input x = {x}   n = {n}")
     print(f"The first {len(exps)} exponents are: {exps}")
-    print(f"Binary approximation = {approx}   (~= {float(approx)})")
+    # to_decimal: str() of a Fraction fails past 4300 digits
+    print(f"Binary approximation = {to_decimal(approx.numerator)}/{to_decimal(approx.denominator)}"
+          f"   (~= {float(approx)})")
     print(f"Exact bits   = 0.{bitstr}")
 
 if __name__ == "__main__":
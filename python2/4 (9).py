@@ -2,6 +2,8 @@ from decimal import Decimal, getcontext
 from fractions import Fraction
 import math
 
+from constants import dyadic
+
 def required_bits_for_digits(d, safety=3):
     """
     Estimate number of dyadic bits needed for d correct decimal digits.
@@ -19,30 +21,14 @@ def compute_dyadic_bits_of_pi(n):
     # Set decimal precision sufficiently high
     getcontext().prec = n + 20
 
-    # Use a long decimal literal for pi to avoid relying on float rounding
-    PI_STR = '3.14159265358979323846264338327950288419716939937510'
-    pi_dec = Decimal(PI_STR)
-
-    frac = pi_dec - int(pi_dec)  # fractional part in Decimal
-    bits = []
-    numerator = 0
-    denominator = 1 << n  # 2^n
-
-    for i in range(1, n+1):
-        frac *= 2
-        if frac >= 1:
-            bits.append(1)
-            # set corresponding bit in numerator (most-significant-first)
-            numerator += 1 << (n - i)
-            frac -= 1
-        else:
-            bits.append(0)
-
-    dyadic_fraction = Fraction(numerator, denominator)
-    dyadic_decimal = Decimal(numerator) / Decimal(denominator)
+    # one big int floor(pi * 2^n) (constants.py, cached on disk); the bits,
+    # the Fraction and the Decimal are all exact views of it
+    d = dyadic("pi", n)
+    dyadic_fraction = d.fraction()
+    dyadic_decimal = d.decimal()
     pi_approx = Decimal(3) + dyadic_decimal
 
-    return tuple(bits), dyadic_fraction, dyadic_decimal, pi_approx
+    return tuple(d), dyadic_fraction, dyadic_decimal, pi_approx
 
 def format_bits(bits):
     return "(" + ", ".join(str(b) for b in bits) + ")"
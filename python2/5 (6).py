@@ -1,45 +1,32 @@
 #!/usr/bin/env python3
 from fractions import Fraction
 
+from dyadic import dyadic_bits
+from leibniz import alternating_sum
+
 def compute_Tp(p):
     """
     Compute Tp = 4 * sum_{k=0}^{v} (-1)^k / (2k+1),
     where v = (p-3)//2 (number of terms v+1).
     """
     v = (p - 3) // 2
-    s = Fraction(0, 1)
-    for k in range(v + 1):
-        s += Fraction((-1) ** k, 2 * k + 1)
-    return 4 * s
-
-def fractional_part(frac):
-    """Return fractional part of a Fraction in [0,1)."""
-    # int(frac) works with Fraction -> truncates toward zero; safe here
-    return frac - int(frac)
+    return 4 * alternating_sum(v + 1)
 
 def dyadic_bits_of_fraction(frac, n):
     """
-    Return (bits, dyadic_fraction) where:
-      - bits is a list of n bits (0/1) for the fractional part of frac
-      - dyadic_fraction is a Fraction representing sum_{i=1..n} b_i / 2^i
-    Uses exact Fraction arithmetic.
+    Return (bits, (m, n)) where:
+      - bits is a lazy dyadic.DyadicBits view of the n bits (0/1) of the
+        fractional part of frac
+      - m / 2^n = sum_{i=1..n} b_i / 2^i is the truncated dyadic value
+    Uses one exact integer division, (num << n) // den.
     """
-    f = fractional_part(frac)
-    bits = []
-    val = Fraction(0, 1)
-    for i in range(1, n + 1):
-        f *= 2
-        if f >= 1:
-            bits.append(1)
-            val += Fraction(1, 2 ** i)
-            f -= 1
-        else:
-            bits.append(0)
-    return bits, val
+    bits = dyadic_bits(frac.numerator, frac.denominator, n)
+    return bits, bits.as_pair()
 
 def format_row(p, n, Qmin):
     Tp = compute_Tp(p)
-    bits, dyadic_frac = dyadic_bits_of_fraction(Tp, n)
+    bits, (m, _) = dyadic_bits_of_fraction(Tp, n)
+    dyadic_frac = Fraction(m, 1 << n)
     dyadic_dec = float(dyadic_frac)
     pi_Q = float(4 * dyadic_frac)
     binary_err = f"2^-{n}"
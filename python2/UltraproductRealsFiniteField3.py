@@ -1,6 +1,8 @@
 from fractions import Fraction
-from sympy import primerange
-from math import prod
+from typing import Dict, List
+
+from legendre import legendre_symbols, small_primes
+from symbol_index import SymbolIndex
 
 def distinct_legendre_sequence(rational_str: str, max_prime: int):
     """
@@ -9,32 +11,35 @@ def distinct_legendre_sequence(rational_str: str, max_prime: int):
     """
     # parse and reduce
     frac = Fraction(rational_str)
-    m, n = frac.numerator, frac.denominator
-
-    # compute P = product of primes <= max_prime
-    primes = list(primerange(2, max_prime+1))
-    P = prod(primes)
+    n = frac.denominator
 
-    if n >= P:
+    # n < P = product of primes <= max_prime, without forming P: stop
+    # multiplying as soon as the partial product passes n
+    P = 1
+    for p in small_primes(max_prime).tolist():
+        P *= p
+        if P > n:
+            break
+    else:
         raise ValueError(
             f"Denominator n={n} must be < product of primes P={P} "
             f"for uniqueness."
         )
 
-    seq = {}
-    for p in primes:
-        # inverse exists since gcd(n,p)=1
-        inv_n = pow(n, p-2, p)
-        a_p = (m * inv_n) % p
-
-        # Legendre symbol
-        ls = pow(a_p, (p-1)//2, p)
-        if a_p == 0:
-            seq[p] = 0
-        else:
-            seq[p] =  1 if ls == 1 else -1
+    # Jacobi symbols over blocks of primes (legendre.py); 0 where p | m or p | n
+    primes, symbols = legendre_symbols(frac, max_prime)
+    return dict(zip(primes.tolist(), symbols.tolist()))
 
-    return seq
+def rationals_with_symbols(seq: Dict[int, int], k: int = 32,
+                           max_height: int = 1000) -> List[Fraction]:
+    """
+    The inverse direction: the reduced m/n with max(|m|, n) <= max_height
+    whose symbols at the first k primes match seq, smallest height first.
+    Uses (and grows) the on-disk index of symbol_index.py.
+    """
+    index = SymbolIndex.load(k).extend(max_height)
+    return [q for q in index.lookup(seq)
+            if max(abs(q.numerator), q.denominator) <= max_height]
 
 # Example usage:
 if __name__ == "__main__":
@@ -42,3 +47,8 @@ if __name__ == "__main__":
     rstr  = input("Enter rational m/n (in lowest terms): ")
     seq   = distinct_legendre_sequence(rstr, max_p)
     print(seq)
+
+    k = min(len(seq), 32)
+    if k:
+        print(f"Rationals of height <= 1000 with the same symbols at the first {k} primes:",
+              rationals_with_symbols(seq, k)[:10])
@@ -1,5 +1,8 @@
-from fractions import Fraction
 import math
+import sys
+
+from dyadic import dyadic_bits
+from leibniz import LeibnizAccumulator
 
 # ---------- parameters ----------
 p = 65537          # choose your p
@@ -16,49 +19,30 @@ def is_prime(m):
             return False
     return True
 
-def leibniz_sum(q):
-    s = Fraction(0,1)
-    for k in range(q):
-        s += Fraction(1, 4*k+1) - Fraction(1, 4*k+3)
-    return s
-
-def fractional_part(frac):
-    # frac is a Fraction; return its fractional part in [0,1)
-    return frac - (frac.numerator // frac.denominator)
-
-def dyadic_bits(frac, n):
-    # return tuple of n bits (b1..bn) for fractional part of frac (truncation)
-    f = fractional_part(frac)
-    bits = []
-    for _ in range(n):
-        f = f * 2
-        if f >= 1:
-            bits.append(1)
-            f -= 1
-        else:
-            bits.append(0)
-    return tuple(bits)
-
 # ---------- compute dyadic for T_p ----------
-Tp = 4 * leibniz_sum(p)            # exact Fraction
-bits_p = dyadic_bits(Tp, n)
+if hasattr(sys, "set_int_max_str_digits"):
+    sys.set_int_max_str_digits(0)   # T_p is printed exactly below
+acc = LeibnizAccumulator.resume(p)  # S_p, from the nearest checkpoint
+Tp = acc.pi()                       # exact Fraction
+bits_p = dyadic_bits(4 * acc.num, acc.den, n)   # (num << n) // den, no gcd
 
 print("p =", p, "n =", n)
 print("T_p (exact) =", Tp, "≈", float(Tp))
-print("dyadic_n(T_p) bits =", bits_p)
+print("dyadic_n(T_p) bits =", tuple(bits_p))
 
 # ---------- search for q > p with same dyadic bits ----------
 found = []
 for q in range(p+1, q_limit+1):
     if not is_prime(q):
         continue
-    Tq = 4 * leibniz_sum(q)
-    if dyadic_bits(Tq, n) == bits_p:
-        found.append((q, Tq, dyadic_bits(Tq, n)))
+    acc.extend_to(q)                # only the terms p..q-1 are new
+    bits = dyadic_bits(4 * acc.num, acc.den, n)
+    if bits == bits_p:
+        found.append((q, 4 * acc.num / acc.den, bits))
 
 if found:
     print("\nMatches found (q, dyadic bits):")
     for q, Tq, bits in found:
-        print(" q =", q, " T_q ≈", float(Tq), " bits =", bits)
+        print(" q =", q, " T_q ≈", Tq, " bits =", tuple(bits))
 else:
     print("\nNo match for q in (p, {}]. Try increasing q_limit or reducing n.".format(q_limit))
@@ -6,22 +6,15 @@ import math
 from decimal import Decimal, getcontext, ROUND_FLOOR
 from fractions import Fraction
 
+from constants import decimal
+
 def compute_pi(n_digits):
     """
-    Compute pi to n_digits decimal places via the Gauss–Legendre algorithm.
+    pi to n_digits decimal places (plus 8 guard places), truncated; taken
+    from constants.py, which computes it once and caches it on disk.
     """
     getcontext().prec = n_digits + 8
-    one, two, four = Decimal(1), Decimal(2), Decimal(4)
-    a, b, t, p = one, one / two.sqrt(), one / four, one
-
-    # ~log2(n_digits) iterations for convergence
-    for _ in range(int(math.log2(n_digits)) + 1):
-        an = (a + b) / two
-        b = (a * b).sqrt()
-        t -= p * (a - an) ** 2
-        a, p = an, p * two
-
-    return (a + b) ** 2 / (four * t)
+    return decimal("pi", n_digits + 8)
 
 def safe_eval(expr: str, consts: dict) -> Decimal:
     """
@@ -92,7 +85,7 @@ def main():
 
     # Prepare constants
     pi_dec = compute_pi(n_dec)
-    e_dec  = Decimal(str(math.e))
+    e_dec  = decimal("e", n_dec)
     consts = {"pi": pi_dec, "e": e_dec}
 
     # Try simple Decimal, otherwise safe_eval
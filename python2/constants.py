@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+constants.py
+
+Mathematical constants to any precision, for the dyadic-bit and greedy
+expansion scripts that used to hard-code 40-80 digit literals (or
+math.pi) and then set a Decimal precision far beyond them.
+
+Every constant c is produced as the exact fixed-point integer
+floor(c * 2^bits). An approximation with 32+ guard bits is computed and
+rounded down; if it lands too close to a multiple of 2^guard to decide,
+the guard is doubled. The constants are irrational, so this always
+terminates. The largest value computed so far is cached on disk as hex
+(CONSTANTS_CACHE, default ~/.cache/myfiles/constants) and in memory.
+A request for fewer bits is a shift of the cached value, so nothing is
+recomputed.
+
+  pi      Chudnovsky series by binary splitting
+  e       sum 1/k! by binary splitting
+  1/pi, 1/e, 2pi, pi/4, sqrt2, e^pi (via mpmath), ...: see CONSTANTS
+
+Example:
+    fixed("pi", 64)          # floor(pi * 2^64)
+    frac_bits("pi", 8)       # 36 = 0b00100100, first 8 bits after the point
+    dyadic("pi", 8)          # the same as a dyadic.DyadicBits
+    decimal("e", 50)         # Decimal('2.718...') with 50 places, truncated
+"""
+import math
+import os
+import tempfile
+from decimal import Context, Decimal
+from typing import Callable, Dict, Tuple
+
+from dyadic import DyadicBits, to_decimal
+
+CACHE_DIR = os.environ.get(
+    "CONSTANTS_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "myfiles", "constants"))
+
+# name -> (bits, floor(c * 2^bits)), the most precise value seen so far
+_memo: Dict[str, Tuple[int, int]] = {}
+
+
+# ── Newton division and square root ───────────────────────────────────
+# CPython's long division and math.isqrt are quadratic; these need only
+# multiplications (Karatsuba), which matters from ~10^5 bits on. Results
+# are within a few units, which the guard bits of fixed() absorb.
+NEWTON_CUTOFF = 1 << 12
+
+
+def _inverse(d: int) -> int:
+    """About 2^(2n) / d for d of n bits."""
+    n = d.bit_length()
+    if n <= NEWTON_CUTOFF:
+        return (1 << (2 * n)) // d
+    h = n // 2 + 16
+    y = _inverse(d >> (n - h)) << (n - h)
+    e = (1 << (2 * n)) - d * y                  # |e| ~ 2^(2n - h)
+    return y + ((y * (e >> (n - 32))) >> (n + 32))
+
+
+def _divide(a: int, b: int, bits: int) -> int:
+    """About a // b, for a quotient of about `bits` bits."""
+    m = bits + 64
+    s = max(b.bit_length() - m, 0)
+    a, b = a >> s, b >> s
+    if bits <= NEWTON_CUTOFF:
+        return a // b
+    k = b.bit_length()
+    return (a * _inverse(b)) >> (2 * k)
+
+
+def _inv_sqrt(c: int, p: int) -> int:
+    """About 2^p / sqrt(c) for a small positive integer c."""
+    if p <= NEWTON_CUTOFF:
+        return math.isqrt((1 << (4 * p)) // c) >> p
+    h = p // 2 + 16
+    y = _inv_sqrt(c, h) << (p - h)
+    e = (1 << (2 * p)) - c * y * y              # |e| ~ 2^(2p - h)
+    return y + ((y * (e >> (p - 32))) >> (p + 33))
+
+
+def _sqrt(c: int, p: int) -> int:
+    """About sqrt(c) * 2^p for a small positive integer c."""
+    return (c * _inv_sqrt(c, p + 8)) >> 8
+
+
+# ── series by binary splitting (approximations of c * 2^prec) ─────────
+def _chudnovsky(prec: int) -> int:
+    """pi * 2^prec to within a few units."""
+    C3_OVER_24 = 640320 ** 3 // 24
+
+    def split(a: int, b: int):
+        if b - a == 1:
+            if a == 0:
+                p = q = 1
+            else:
+                p = (6 * a - 5) * (2 * a - 1) * (6 * a - 1)
+                q = a * a * a * C3_OVER_24
+            t = p * (13591409 + 545140134 * a)
+            return p, q, -t if a & 1 else t
+        m = (a + b) // 2
+        p1, q1, t1 = split(a, m)
+        p2, q2, t2 = split(m, b)
+        return p1 * p2, q1 * q2, t1 * q2 + p1 * t2
+
+    terms = prec // 47 + 2                # each term adds ~47.11 bits
+    _, q, t = split(0, terms)
+    return _divide(426880 * _sqrt(10005, prec) * q, t, prec + 2)
+
+
+def _e_series(prec: int) -> int:
+    """e * 2^prec to within a unit, from sum_{k>=0} 1/k!."""
+    def split(a: int, b: int):
+        # P/Q = sum_{k=a+1}^{b} 1 / ((a+1)(a+2)...k),  Q = (a+1)...b
+        if b - a == 1:
+            return 1, b
+        m = (a + b) // 2
+        p1, q1 = split(a, m)
+        p2, q2 = split(m, b)
+        return p1 * q2 + p2, q1 * q2
+
+    terms = 2
+    while math.lgamma(terms + 1) / math.log(2) < prec + 8:
+        terms *= 2
+    p, q = split(0, terms)
+    return _divide((p + q) << prec, q, prec + 2)
+
+
+def _reciprocal(name: str) -> Callable[[int], int]:
+    def approx(prec: int) -> int:
+        return _divide(1 << (2 * prec + 8), fixed(name, prec + 8), prec)
+    return approx
+
+
+def _scaled(name: str, num: int, den: int) -> Callable[[int], int]:
+    def approx(prec: int) -> int:
+        return fixed(name, prec + 8) * num // den >> 8
+    return approx
+
+
+def _mpmath(expr: Callable) -> Callable[[int], int]:
+    def approx(prec: int) -> int:
+        import mpmath
+
+        with mpmath.workprec(prec + 16):
+            return int(mpmath.floor(mpmath.ldexp(expr(mpmath), prec)))
+    return approx
+
+
+CONSTANTS: Dict[str, Callable[[int], int]] = {
+    "pi": _chudnovsky,
+    "e": _e_series,
+    "1/pi": _reciprocal("pi"),
+    "1/e": _reciprocal("e"),
+    "2pi": _scaled("pi", 2, 1),
+    "pi/2": _scaled("pi", 1, 2),
+    "pi/4": _scaled("pi", 1, 4),
+    "sqrt2": lambda prec: _sqrt(2, prec),
+    "ln2": _mpmath(lambda mp: mp.ln2),
+    "e^pi": _mpmath(lambda mp: mp.exp(mp.pi)),
+    "pi^e": _mpmath(lambda mp: mp.pi ** mp.e),
+}
+
+
+# ── disk cache ────────────────────────────────────────────────────────
+def _path(name: str) -> str:
+    safe = name.replace("/", "_over_").replace("^", "_pow_")
+    return os.path.join(CACHE_DIR, f"{safe}.hex")
+
+
+def _read(name: str):
+    try:
+        with open(_path(name), "r", encoding="ascii") as fh:
+            bits, value = fh.read().split()
+        return int(bits), int(value, 16)
+    except (OSError, ValueError):
+        return None
+
+
+def _write(name: str, bits: int, value: int):
+    """Atomically replace the cache file; an unwritable cache is not an error."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="ascii") as fh:
+            fh.write(f"{bits}\n{value:x}\n")
+        os.replace(tmp, _path(name))
+    except OSError:
+        pass
+
+
+# ── public API ────────────────────────────────────────────────────────
+def fixed(name: str, bits: int) -> int:
+    """floor(c * 2^bits) for the constant called `name`, exactly."""
+    if name not in CONSTANTS:
+        raise KeyError(f"unknown constant {name!r}; known: {', '.join(CONSTANTS)}")
+    if name not in _memo:
+        cached = _read(name)
+        if cached is not None:
+            _memo[name] = cached
+    have = _memo.get(name)
+    if have is not None and have[0] >= bits:
+        return have[1] >> (have[0] - bits)
+    guard = 32
+    while True:
+        approx = CONSTANTS[name](bits + guard)
+        low = approx & ((1 << guard) - 1)
+        if 16 <= low < (1 << guard) - 16:     # error bound well inside the window
+            value = approx >> guard
+            break
+        guard *= 2
+    _memo[name] = (bits, value)
+    _write(name, bits, value)
+    return value
+
+
+def frac_bits(name: str, n: int) -> int:
+    """The first n bits after the binary point of c, as an n-bit integer."""
+    return fixed(name, n) & ((1 << n) - 1)
+
+
+def dyadic(name: str, n: int) -> DyadicBits:
+    """
+    b_1 .. b_n of c's fractional part from the single integer
+    floor(c * 2^n): .as_pair() is (numerator, n) over 2^n, .fraction()
+    and .decimal() are exact, and iteration gives the bits.
+    """
+    return DyadicBits(frac_bits(name, n), n)
+
+
+def digits_to_bits(d: int) -> int:
+    """Bits that pin down d decimal places (with margin)."""
+    return math.ceil(d * math.log2(10)) + 8
+
+
+def decimal(name: str, places: int) -> Decimal:
+    """c truncated to `places` decimal places, as an exact Decimal."""
+    bits = digits_to_bits(places)
+    scale = 10 ** places
+    while True:
+        f = fixed(name, bits)
+        lo, hi = (f * scale) >> bits, ((f + 1) * scale) >> bits
+        if lo == hi or (f + 1) * scale == hi << bits:
+            break
+        bits += 32
+    # every constant here is below 10^40, so lo has < places + 40 digits
+    return to_decimal(lo).scaleb(-places, context=Context(prec=places + 40))
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    bits = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    for name in sys.argv[2:] or ["pi", "e", "1/pi", "e^pi"]:
+        t0 = time.perf_counter()
+        value = fixed(name, bits)
+        dt = time.perf_counter() - t0
+        print(f"{name:>5}: floor(c * 2^{bits}) has {value.bit_length()} bits, "
+              f"{dt:.2f} s")
@@ -3,7 +3,14 @@
 # then print LaTeX table rows: p, n, Q_min, dyadic bits, dyadic value (frac & dec), pi_Q (frac & dec).
 
 from fractions import Fraction
+from multiprocessing import Pool
 import math
+import time
+
+from dyadic import dyadic_bits
+from leibniz import pi_q
+from stabilization import (EXACT_LIMIT, SharedFloors, find_q_min, pi_q_dyadic,
+                           pi_q_float, pi_q_floor)
 
 # ---------- parameters ----------
 pairs = [
@@ -15,34 +22,17 @@ pairs = [
     (131, 42),
     (137, 44),
 ]
-# safe bound multiplier: the theoretical bound grows ~2^n, so choose a practical Q_bound factor
-DEFAULT_Q_BOUND = 100  # increase if needed; may need much larger for big n
+WORKERS = 1  # > 1 fans the pairs out over a process pool (no shared sweep)
 
 # ---------- helpers ----------
 def compute_T_q(q):
     """Compute T_q = 4 * sum_{k=0}^{q-1} (1/(4k+1) - 1/(4k+3)) exactly."""
-    s = Fraction(0, 1)
-    for k in range(q):
-        s += Fraction(1, 4*k + 1) - Fraction(1, 4*k + 3)
-    return 4 * s
-
-def fractional_part(frac):
-    return frac - (frac.numerator // frac.denominator)
+    return pi_q(q)
 
 def dyadic_bits_and_value(frac, n):
-    """Return (bits_tuple, dyadic_value Fraction) for fractional part of frac."""
-    f = fractional_part(frac)
-    bits = []
-    val = Fraction(0, 1)
-    for i in range(1, n+1):
-        f *= 2
-        if f >= 1:
-            bits.append(1)
-            val += Fraction(1, 2**i)
-            f -= 1
-        else:
-            bits.append(0)
-    return tuple(bits), val
+    """Return (bits, (m, n)) for fractional part of frac: m / 2^n truncates it."""
+    bits = dyadic_bits(frac.numerator, frac.denominator, n)
+    return bits, bits.as_pair()
 
 def compute_theoretical_Q_bound(n):
     """
@@ -54,62 +44,75 @@ def compute_theoretical_Q_bound(n):
     return N + 1
 
 # ---------- main search function ----------
-def find_minimal_Q_for_pair(p, n, Q_limit):
+def find_minimal_Q_for_pair(p, n, Q_limit, floor=pi_q_floor):
+    """
+    Detect earliest Q_min >= p such that bits[q] == bits[t] for all t in
+    [Q_min, Q_limit]. T_q increases with q, so that only needs T_Q and
+    T_{Q_limit}, and Q_min is found by galloping + bisection in
+    O(log Q_limit) evaluations (stabilization.py). Returns
+    (Q_min, bits, (m, n), T_Q), T_Q None beyond stabilization.EXACT_LIMIT,
+    or None if p > Q_limit.
     """
-    Search q from p..Q_limit and detect earliest Q_min such that bits[q] == bits[t]
-    for all t in [Q_min, Q_limit]. If none found, return None.
+    Q = find_q_min(p, n, Q_limit, floor=floor)
+    if Q is None:
+        return None
+    bits = pi_q_dyadic(Q, n, floor=floor)
+    return Q, bits, bits.as_pair(), (compute_T_q(Q) if Q <= EXACT_LIMIT else None)
+
+def _timed_pair(pair):
+    p, n = pair
+    t0 = time.perf_counter()
+    result = find_minimal_Q_for_pair(p, n, compute_theoretical_Q_bound(n))
+    return result, time.perf_counter() - t0
+
+def build_table(pairs, workers=1):
     """
-    bits_for_q = {}
-    # compute T_q incrementally for efficiency
-    s = Fraction(0, 1)
-    # We'll compute up to Q_limit
-    for q in range(1, Q_limit + 1):
-        k = q - 1
-        s += Fraction(1, 4*k + 1) - Fraction(1, 4*k + 3)
-        Tq = 4 * s
-        if q >= p:
-            bits, val = dyadic_bits_and_value(Tq, n)
-            bits_for_q[q] = (bits, val, Tq)
+    Return [(result, seconds)] for each (p, n) in pairs, in input order.
 
-    # search minimal Q_min
-    for Q in range(p, Q_limit + 1):
-        target_bits = bits_for_q[Q][0]
-        stable = True
-        for t in range(Q, Q_limit + 1):
-            if bits_for_q[t][0] != target_bits:
-                stable = False
-                break
-        if stable:
-            bits, val, TQ = bits_for_q[Q]
-            return Q, bits, val, TQ
-    return None
+    Serially the pairs are swept once in order of n. All of them share one
+    SharedFloors cache, and each n starts from the previous n's
+    unconstrained Q_min: Q_min(p, n) = max(p, Q_min(1, n)), and more bits
+    never stabilise sooner. With workers > 1 the pairs are instead
+    computed independently on a process pool.
+    """
+    if workers > 1:
+        with Pool(workers) as pool:
+            return pool.map(_timed_pair, pairs)
+    floor = SharedFloors(max(n for _, n in pairs))
+    out = [None] * len(pairs)
+    start = 1  # Q_min(1, n) of the previous n
+    for i in sorted(range(len(pairs)), key=lambda i: (pairs[i][1], pairs[i][0])):
+        p, n = pairs[i]
+        t0 = time.perf_counter()
+        Q_limit = compute_theoretical_Q_bound(n)
+        # never None: Q_limit grows with n, so start <= previous Q_limit <= Q_limit
+        start = find_q_min(start, n, Q_limit, floor=floor)
+        result = find_minimal_Q_for_pair(max(p, start), n, Q_limit, floor=floor)
+        out[i] = (result, time.perf_counter() - t0)
+    return out
 
 # ---------- run for all pairs and print LaTeX rows ----------
 if __name__ == "__main__":
     print("% LaTeX table rows: p & n & Q_min & dyadic_bits & dyadic_value & pi_Q \\\\")
-    for p, n in pairs:
-        # choose Q_limit: min of theory and DEFAULT_Q_BOUND to keep runtime manageable;
-        # for very large n the theory bound is enormous, so allow DEFAULT_Q_BOUND cap.
-        theory_bound = compute_theoretical_Q_bound(n)
-        Q_limit = min(theory_bound, DEFAULT_Q_BOUND)
-        # If theory_bound is smaller than reasonable, use it; otherwise use DEFAULT_Q_BOUND and warn
-        use_note = ""
-        if theory_bound > DEFAULT_Q_BOUND:
-            use_note = f" (search capped at {DEFAULT_Q_BOUND}, theoretical bound {theory_bound})"
-        result = find_minimal_Q_for_pair(p, n, Q_limit)
+    # the full theoretical bound: the bisection search needs only
+    # O(log Q_limit) evaluations, so no practical cap is required
+    for (p, n), (result, seconds) in zip(pairs, build_table(pairs, WORKERS)):
+        timing = f" % {seconds * 1000:.1f} ms"
         if result is None:
-            print(f"% p={p}, n={n}: no stabilizing Q found up to Q_limit={Q_limit}{use_note}")
+            Q_limit = compute_theoretical_Q_bound(n)
+            print(f"% p={p}, n={n}: no stabilizing Q found up to Q_limit={Q_limit}")
             # print an empty LaTeX row you can fill later
-            print(f"{p} & {n} & - & - & - & - \\\\")
+            print(f"{p} & {n} & - & - & - & - \\\\{timing}")
             continue
-        Q_min, bits, dyadic_val, pi_Q = result
+        Q_min, bits, (m, _), pi_Q = result
+        dyadic_val = Fraction(m, 1 << n)
         # format bits as (b1,b2,...)
         bits_str = "(" + ", ".join(str(b) for b in bits) + ")"
         # dyadic value fraction and decimal (with 15 digits)
         dy_frac = f"{dyadic_val.numerator}/{dyadic_val.denominator}"
         dy_dec = f"{float(dyadic_val):.15f}"
-        # pi_Q fraction and decimal
-        pi_frac = f"{pi_Q.numerator}/{pi_Q.denominator}"
-        pi_dec = f"{float(pi_Q):.15f}"
+        # pi_Q fraction (while it is small enough to write out) and decimal
+        pi_frac = "" if pi_Q is None else f"{pi_Q.numerator}/{pi_Q.denominator}"
+        pi_dec = f"{pi_q_float(Q_min):.15f}"
         # print LaTeX row
-        print(f"{p} & {n} & {Q_min} & {bits_str} & ${dy_frac}\\approx {dy_dec}$ & ${pi_frac}\\approx {pi_dec}$ \\\\")
+        print(f"{p} & {n} & {Q_min} & {bits_str} & ${dy_frac}\\approx {dy_dec}$ & ${pi_frac}\\approx {pi_dec}$ \\\\{timing}")
@@ -1,9 +1,11 @@
 import math
 
-def finite_field_pi_fraction_polygon(p):
+def finite_field_pi_fraction_polygon(p, pi_fraction=None):
     """
     Approximate π using the area of a polygon with p points in the finite field Z_p
     and represent it as a fraction modulo p.
+    pi_fraction: an exact rational approximation of π to map into Z_p instead
+    (e.g. approx_pi.lattice_pi(r)[0]); its denominator must be prime to p.
     """
     if p <= 2:
         raise ValueError("p must be greater than 2 to form a meaningful polygon")
@@ -22,9 +24,13 @@ def finite_field_pi_fraction_polygon(p):
     # Approximate π using the polygon's area
     approx_pi = p * math.sin(2 * math.pi / p) / 2  # Approximation
 
-    # Scale π to create a fraction in Z_p
-    numerator = round(approx_pi * (p - 1))  # Scale by (p - 1) instead of p
-    denominator = p - 1  # Use p - 1 to avoid zero modulo p
+    if pi_fraction is not None:
+        # An exact rational has an image in Z_p as it stands
+        numerator, denominator = pi_fraction.numerator, pi_fraction.denominator
+    else:
+        # Scale π to create a fraction in Z_p
+        numerator = round(approx_pi * (p - 1))  # Scale by (p - 1) instead of p
+        denominator = p - 1  # Use p - 1 to avoid zero modulo p
 
     # Reduce numerator and denominator modulo p
     numerator_mod = numerator % p
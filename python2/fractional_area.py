@@ -1,5 +1,7 @@
 import math
 
+from approx_pi import lattice_pi
+
 def approximate_pi(n):
     """
     Approximates the value of pi using the area of a regular polygon with n sides.
@@ -26,6 +28,15 @@ def approximate_pi(n):
     denominator = 10 ** 6
     return polygon_area, (numerator, denominator)
 
+def approximate_pi_lattice(r):
+    """
+    Same return shape as approximate_pi, from the exact lattice-point count
+    in the circle of radius r (approx_pi.lattice_pi): the fraction is
+    N(r) / r^2 exactly, not a float rounded to 6 places.
+    """
+    fraction, _ = lattice_pi(r)
+    return float(fraction), (fraction.numerator, fraction.denominator)
+
 
 # Example usage:
 n = 65536  # Replace with your desired number of sides
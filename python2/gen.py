@@ -1,58 +1,45 @@
 # field_tables_with_labels.py
 
-import itertools
-from sympy import Poly, symbols
+import numpy as np
+from sympy import symbols
+
+from field_registry import minimal_primitive
+from gf_field import GFField
+from latex_tables import label_lookup, open_tex, write_cayley_table
 
 # ─── Configuration ─────────────────────────────────────────────
 p = 2                       # prime characteristic
 n = 8                       # extension degree
-x = symbols('x')           
-modulus_poly = x**2 + x + 1  # irreducible polynomial over GF(p)
-modulus = Poly(modulus_poly, x, modulus=p)
+x = symbols('x')
+# irreducible (primitive) polynomial of degree n over GF(p), from the registry
+modulus = minimal_primitive(p, n)
+field = GFField(p, n, modulus)
 # ───────────────────────────────────────────────────────────────
 
-# Generate all field elements as polynomials of degree < n
-raw_elements = [
-    sum(c * x**i for i, c in enumerate(coeffs))
-    for coeffs in itertools.product(range(p), repeat=n)
-]
-
-# Map each element to a number label
-element_map = {i: raw_elements[i] for i in range(len(raw_elements))}
+# Element i is the polynomial whose base-p digits are its coefficients,
+# so the label of an element is the element itself.
+element_map = {i: field.to_expr(i, x) for i in range(field.q)}
+index_label = label_lookup([str(i) for i in range(field.q)])
 
 def ff_add(a, b):
-    pa = Poly(a, x, modulus=p)
-    pb = Poly(b, x, modulus=p)
-    return (pa + pb).set_modulus(p).as_expr()
+    return field.add(a, b)
 
 def ff_mul(a, b):
-    pa = Poly(a, x, modulus=p)
-    pb = Poly(b, x, modulus=p)
-    product = pa * pb
-    _, remainder = product.div(modulus)
-    return remainder.as_expr()
-
-def find_index(expr):
-    """Find the index of a polynomial expression in element_map."""
-    for i, poly in element_map.items():
-        if Poly(poly, x, modulus=p).as_expr() == Poly(expr, x, modulus=p).as_expr():
-            return i
-    return None
-
-def write_latex_table(op, func, filename):
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write("\\begin{tabular}{c|" + "c" * len(element_map) + "}\n")
-        header = f"{op} & " + " & ".join([f"{i}" for i in element_map]) + " \\\\\n"
-        f.write(header)
-        f.write("\\midrule\n")
-        for i in element_map:
-            row = [f"{i}"]
-            for j in element_map:
-                result = func(element_map[i], element_map[j])
-                idx = find_index(result)
-                row.append(str(idx) if idx is not None else "?")
-            f.write(" & ".join(row) + " \\\\\n")
-        f.write("\\end{tabular}\n")
+    return field.mul(a, b)
+
+def find_index(elem):
+    """Index of an element in element_map: elements are their own indices."""
+    return int(elem)
+
+def write_latex_table(op, func, filename, **layout):
+    """
+    Stream the Cayley table of func to filename, one block of rows at a
+    time. Layout options (tile_cols, tile_rows, longtable, block_rows) are
+    passed to latex_tables.write_table.
+    """
+    with open_tex(filename) as f:
+        write_cayley_table(f, func, np.arange(field.q), index_label, op,
+                           rule="\n\\midrule", **layout)
 
 def write_polynomial_list(filename):
     with open(filename, 'w', encoding='utf-8') as f:
@@ -67,4 +54,5 @@ if __name__ == "__main__":
     write_polynomial_list("poly_list.tex")
     write_latex_table('+', ff_add, "add_table.tex")
     write_latex_table('*', ff_mul, "mul_table.tex")
-    print("✓ Generated poly_list.tex, add_table.tex, and mul_table.tex")
+    print(f"✓ Generated poly_list.tex, add_table.tex, and mul_table.tex "
+          f"for GF({p}^{n}) modulo {modulus.to_sympy(x).as_expr()}")
@@ -1,45 +1,34 @@
 # generate_field.py
 
-import itertools
-from sympy import Poly, symbols
+import numpy as np
+from sympy import symbols
+
+from field_registry import minimal_primitive
+from gf_field import GFField
+from latex_tables import label_lookup, open_tex, write_cayley_table
 
 # parameters: prime p, extension degree n, irreducible modulus over GF(p)
 p = 2
 n = 4
 x = symbols('x')
-modulus_poly = x**2 + x + 1
-modulus = Poly(modulus_poly, x, modulus=p)
+modulus = minimal_primitive(p, n)
+field = GFField(p, n, modulus)
 
-# enumerate all field elements as polynomials of degree < n
-elements = [
-    sum(coeff * x**i for i, coeff in enumerate(coeffs))
-    for coeffs in itertools.product(range(p), repeat=n)
-]
+# enumerate all field elements (integer codes) in the usual product order,
+# with their polynomial labels computed once
+elements = np.array(field.product_order())
+label = label_lookup([f"${field.to_expr(e, x)}$" for e in range(field.q)])
 
 def ff_add(a, b):
-    pa = Poly(a, x, modulus=p)
-    pb = Poly(b, x, modulus=p)
-    return (pa + pb).set_modulus(p).as_expr()
+    return field.add(a, b)
 
 def ff_mul(a, b):
-    pa = Poly(a, x, modulus=p)
-    pb = Poly(b, x, modulus=p)
-    product = pa * pb
-    _, remainder = product.div(modulus)
-    return remainder.as_expr()
-
-def write_latex_table(op, func, filename):
-    """Emit a LaTeX tabular for '+' or '*' using func(a,b)."""
-    with open(filename, 'w', encoding='utf-8') as f:
-        # header
-        f.write("\\begin{tabular}{c|" + "c" * len(elements) + "}\n")
-        f.write(f"{op} & " + " & ".join(f"${e}$" for e in elements) + " \\\\\n")
-        f.write("\\midrule\n")
-        # rows
-        for a in elements:
-            row = [f"${a}$"] + [f"${func(a, b)}$" for b in elements]
-            f.write(" & ".join(row) + " \\\\\n")
-        f.write("\\end{tabular}\n")
+    return field.mul(a, b)
+
+def write_latex_table(op, func, filename, **layout):
+    """Emit a LaTeX tabular for '+' or '*' using func(a,b), streamed by row blocks."""
+    with open_tex(filename) as f:
+        write_cayley_table(f, func, elements, label, op, rule="\n\\midrule", **layout)
 
 if __name__ == "__main__":
     write_latex_table('+', ff_add, "add_table.tex")
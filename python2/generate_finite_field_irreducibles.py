@@ -13,31 +13,25 @@ Example:
 """
 import sys
 import math
-from itertools import product
 
 import sympy as sp
 from sympy import Poly
 from sympy.abc import x
 
+from field_registry import list_fields, minimal_irreducible
+
 
 def find_irreducible_polynomial(p: int, n: int) -> Poly:
     """
-    Brute‐force search for the lexicographically smallest monic irreducible
+    Search for the lexicographically smallest monic irreducible
     polynomial of degree n over GF(p).
 
+    Served from the shared field_registry (shipped table, on-disk cache,
+    then the native gfp_poly search); only the result is converted.
+
     Returns a SymPy Poly with modulus=p, or None if not found.
     """
-    # iterate over all tuples of coefficients for x^(n-1), ..., x^0
-    for coeffs in product(range(p), repeat=n):
-        # build the polynomial: x^n + coeffs[n-1]*x^(n-1) + ... + coeffs[0]
-        expr = x**n
-        for i, a in enumerate(coeffs, start=0):
-            # coeffs[0] → x^0, coeffs[1] → x^1, ..., coeffs[n-1] → x^(n-1)
-            expr += a * x**i
-        poly = Poly(expr, x, modulus=p)
-        if poly.is_irreducible:
-            return poly
-    return None
+    return minimal_irreducible(p, n).to_sympy(x)
 
 
 def generate_finite_fields(max_q: int):
@@ -51,22 +45,9 @@ def generate_finite_fields(max_q: int):
     Returns:
       List of (q, p, n, Poly)
     """
-    result = []
-    # generate primes up to max_q
-    for p in sp.primerange(2, max_q):
-        # try exponents n = 1, 2, ... until p^n >= max_q
-        n = 1
-        while True:
-            q = p**n
-            if q >= max_q:
-                break
-            f = find_irreducible_polynomial(p, n)
-            if f is not None:
-                result.append((q, p, n, f))
-            n += 1
-    # sort by field size q
-    result.sort(key=lambda tup: tup[0])
-    return result
+    # every (p, n) with p^n < max_q, already sorted by field size q;
+    # the polynomials are registry lookups rather than fresh searches
+    return [(q, p, n, f.to_sympy(x)) for q, p, n, f in list_fields(max_q)]
 
 
 def main():
@@ -12,29 +12,22 @@ to skip the prompt and use MAX_Q=50 directly.
 """
 
 import sys
-from itertools import product
 
-# sympy is used for prime generation and irreducibility tests
+# sympy is used for prime generation and for printing the results
 import sympy as sp
 from sympy import Poly
 from sympy.abc import x
 
+# polynomials come from the shared registry (native GF(p)[x] search on a miss)
+from field_registry import list_fields, minimal_irreducible
+
 
 def find_irreducible_polynomial(p: int, n: int) -> Poly:
     """
-    Brute-force search for the lexicographically smallest monic irreducible
+    Search for the lexicographically smallest monic irreducible
     polynomial of degree n over GF(p). Returns a sympy.Poly or None.
     """
-    # Try all choices of coefficients for x^(n-1),…,x^0 in GF(p)
-    for coeffs in product(range(p), repeat=n):
-        # Build x^n + a_{n-1} x^(n-1) + … + a_0
-        expr = x**n
-        for i, a in enumerate(coeffs):
-            expr += a * x**i
-        poly = Poly(expr, x, modulus=p)
-        if poly.is_irreducible:
-            return poly
-    return None
+    return minimal_irreducible(p, n).to_sympy(x)
 
 
 def generate_finite_fields(max_q: int):
@@ -45,20 +38,8 @@ def generate_finite_fields(max_q: int):
       - q = p^n < max_q,
       - f(x) is a monic irreducible polynomial in GF(p)[x] of degree n.
     """
-    result = []
-    # Generate all primes p < max_q
-    for p in sp.primerange(2, max_q):
-        n = 1
-        while True:
-            q = p**n
-            if q >= max_q:
-                break
-            f = find_irreducible_polynomial(p, n)
-            if f:
-                result.append((q, p, n, f))
-            n += 1
-    # Sort by field size q
-    return sorted(result, key=lambda t: t[0])
+    # Registry lookups for every p^n < max_q, sorted by field size q
+    return [(q, p, n, f.to_sympy(x)) for q, p, n, f in list_fields(max_q)]
 
 
 def main():
@@ -6,29 +6,24 @@ polynomial and the defining relation for a root α.
 """
 
 import sys
-from itertools import product
 
 import sympy as sp
 from sympy import Poly
 from sympy.abc import x
 
+from field_registry import minimal_irreducible
+
 
 def find_irreducible_poly(p: int):
     """
     Search for the smallest-degree monic irreducible polynomial over GF(p).
     Returns a sympy.Poly, or None if none found up through degree p.
     """
-    # skip n=1 (all x+a are irreducible but trivial), start at n=2
-    for n in range(2, p + 1):
-        for coeffs in product(range(p), repeat=n):
-            # build x^n + a_{n-1} x^{n-1} + … + a_0
-            expr = x**n
-            for i, a in enumerate(coeffs):
-                expr += a * x**i
-            poly = Poly(expr, x, modulus=p)
-            if poly.is_irreducible:
-                return poly
-    return None
+    # skip n=1 (all x+a are irreducible but trivial); degree 2 always
+    # exists, so this is a single registry lookup
+    if p < 2:
+        return None
+    return minimal_irreducible(p, 2).to_sympy(x)
 
 
 def format_defining_relation(poly: Poly, p: int):
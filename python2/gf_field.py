@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+gf_field.py
+
+Integer-encoded finite field GF(p^n).
+
+An element is the integer whose base-p digits are its polynomial
+coefficients: c_0 + c_1 x + ... + c_{n-1} x^(n-1)  <->  c_0 + c_1 p + ...
++ c_{n-1} p^(n-1). Multiplication, inversion and (for odd p) addition go
+through exp/log/Zech-log tables built once from a primitive element, so
+every operation is a handful of NumPy gathers and works elementwise on
+whole arrays; a full q x q Cayley table is one broadcast call.
+
+Example:
+    F = GFField(2, 8)                 # modulus from field_registry
+    a = np.arange(F.q)
+    mul_table = F.mul(a[:, None], a[None, :])
+"""
+from itertools import product
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from gfp_poly import GFpPoly, is_irreducible
+
+
+class GFField:
+    """
+    GF(p^n) defined by a monic irreducible modulus of degree n.
+
+    If no modulus is given the lexicographically minimal primitive
+    polynomial from field_registry is used, so x itself generates the
+    multiplicative group. Otherwise the least primitive element is searched.
+    """
+
+    def __init__(self, p: int, n: int = 1, modulus: Optional[GFpPoly] = None):
+        if modulus is None:
+            from field_registry import minimal_primitive
+
+            modulus = minimal_primitive(p, n)
+        modulus = modulus.make_monic()
+        if modulus.p != p or modulus.degree != n:
+            raise ValueError(f"modulus must have degree {n} over GF({p})")
+        if not is_irreducible(modulus):
+            raise ValueError(f"{modulus} is not irreducible over GF({p})")
+        self.p, self.n, self.q = p, n, p ** n
+        self.modulus = modulus
+        self._pw = p ** np.arange(n, dtype=np.int64)
+        self._build_tables()
+
+    # ── encoding ──────────────────────────────────────────────────────
+    def index(self, coeffs: Sequence[int]) -> int:
+        """Integer code of the element with coefficients c_0, ..., c_{n-1}."""
+        return int(sum((int(c) % self.p) * self.p ** i for i, c in enumerate(coeffs)))
+
+    def coeffs(self, a) -> np.ndarray:
+        """Coefficients c_0, ..., c_{n-1} along a new last axis."""
+        return (np.asarray(a, dtype=np.int64)[..., None] // self._pw) % self.p
+
+    def product_order(self) -> List[int]:
+        """
+        Codes of all elements in itertools.product(range(p), repeat=n) order
+        on (c_0, ..., c_{n-1}), the order the SymPy scripts listed them in.
+        """
+        return [self.index(v) for v in product(range(self.p), repeat=self.n)]
+
+    def poly_str(self, a: int, var: str = "x") -> str:
+        """Human-readable polynomial, highest degree first (SymPy-style)."""
+        terms = []
+        for i, c in reversed(list(enumerate(self.coeffs(a).tolist()))):
+            if not c:
+                continue
+            mono = "" if i == 0 else (var if i == 1 else f"{var}**{i}")
+            if not mono:
+                terms.append(str(c))
+            else:
+                terms.append(mono if c == 1 else f"{c}*{mono}")
+        return " + ".join(terms) or "0"
+
+    def to_expr(self, a: int, x=None):
+        """SymPy expression of element a (for output only)."""
+        from sympy import Symbol
+
+        x = Symbol("x") if x is None else x
+        return sum(int(c) * x ** i for i, c in enumerate(self.coeffs(a)))
+
+    # ── tables ────────────────────────────────────────────────────────
+    def _step_matrix(self, g: np.ndarray) -> np.ndarray:
+        """Matrix of multiplication by g on coefficient row vectors."""
+        p, n = self.p, self.n
+        m = np.zeros((n, n), dtype=np.int64)
+        basis = GFpPoly([1], p)
+        gx = GFpPoly(g, p)
+        for i in range(n):
+            row = (basis * gx) % self.modulus
+            m[i, : len(row.c)] = row.c
+            basis = basis * GFpPoly([0, 1], p)
+        return m
+
+    def _cycle(self, g: int) -> Optional[np.ndarray]:
+        """Powers g^0 .. g^(q-2) as codes, or None if g is not primitive."""
+        q, p = self.q, self.p
+        step = self._step_matrix(self.coeffs(g))
+        exp = np.empty(q - 1, dtype=np.int64)
+        cur = np.zeros(self.n, dtype=np.int64)
+        cur[0] = 1
+        for k in range(q - 1):
+            code = int(cur @ self._pw)
+            if k and code == 1:
+                return None
+            exp[k] = code
+            cur = (cur @ step) % p
+        return exp
+
+    def _build_tables(self):
+        q = self.q
+        if q == 2:
+            exp = np.array([1], dtype=np.int64)
+            self.generator = 1
+        else:
+            start = 1 if self.n == 1 else self.p        # the code of x
+            for g in range(start, q):
+                exp = self._cycle(g)
+                if exp is not None:
+                    self.generator = g
+                    break
+        log = np.zeros(q, dtype=np.int64)
+        log[exp] = np.arange(q - 1)
+        self.exp, self.log = exp, log
+        # Zech logarithm: g^zech[k] = 1 + g^k, with -1 where 1 + g^k = 0
+        one_plus = self._add_digits(np.ones(q - 1, dtype=np.int64), exp)
+        self.zech = np.where(one_plus == 0, -1, log[one_plus])
+
+    def _add_digits(self, a, b):
+        """Digitwise addition mod p (used only while building tables)."""
+        if self.p == 2:
+            return np.bitwise_xor(a, b)
+        return ((self.coeffs(a) + self.coeffs(b)) % self.p) @ self._pw
+
+    # ── arithmetic (all elementwise, broadcasting) ────────────────────
+    def add(self, a, b):
+        """a + b."""
+        a, b = np.asarray(a, dtype=np.int64), np.asarray(b, dtype=np.int64)
+        if self.p == 2:
+            return (a ^ b)[()]
+        m = self.q - 1
+        la, lb = self.log[a], self.log[b]
+        z = self.zech[(lb - la) % m]
+        out = np.where(z < 0, 0, self.exp[(la + z) % m])
+        return np.where(a == 0, b, np.where(b == 0, a, out))[()]
+
+    def neg(self, a):
+        """-a."""
+        a = np.asarray(a, dtype=np.int64)
+        if self.p == 2:
+            return a[()]
+        m = self.q - 1
+        return np.where(a == 0, 0, self.exp[(self.log[a] + m // 2) % m])[()]
+
+    def sub(self, a, b):
+        """a - b."""
+        return self.add(a, self.neg(b))
+
+    def mul(self, a, b):
+        """a * b."""
+        a, b = np.asarray(a, dtype=np.int64), np.asarray(b, dtype=np.int64)
+        out = self.exp[(self.log[a] + self.log[b]) % (self.q - 1)]
+        return np.where((a == 0) | (b == 0), 0, out)[()]
+
+    def inv(self, a):
+        """a^(-1); raises ZeroDivisionError if any a is 0."""
+        a = np.asarray(a, dtype=np.int64)
+        if np.any(a == 0):
+            raise ZeroDivisionError("0 has no inverse in GF(%d)" % self.q)
+        m = self.q - 1
+        return self.exp[(-self.log[a]) % m][()]
+
+    def div(self, a, b):
+        """a / b."""
+        return self.mul(a, self.inv(b))
+
+    def pow(self, a, e: int):
+        """a^e for an integer e (negative e needs a != 0)."""
+        a = np.asarray(a, dtype=np.int64)
+        if e == 0:
+            return np.ones_like(a)[()]
+        m = self.q - 1
+        if e < 0:
+            a, e = np.asarray(self.inv(a)), -e
+        out = self.exp[(self.log[a] * (e % m)) % m]
+        return np.where(a == 0, 0, out)[()]
+
+    def __repr__(self) -> str:
+        return f"GFField({self.p}, {self.n}, modulus={self.modulus})"
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    p = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    t0 = time.perf_counter()
+    F = GFField(p, n)
+    a = np.arange(F.q)
+    rows = 0
+    for start in range(0, F.q, 256):          # row blocks keep memory bounded
+        block = F.mul(a[start:start + 256, None], a[None, :])
+        rows += len(block)
+    dt = time.perf_counter() - t0
+    print(f"{F}: {rows}x{F.q} multiplication table in {dt * 1000:.1f} ms")
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+gfp2.py
+
+Vectorised arithmetic in the quadratic extension GF(p^2) = GF(p)[i]/(i^2 - d)
+for an odd prime p and any quadratic non-residue d (d = -1 when p ≡ 3 mod 4
+gives the familiar a + bi with i^2 = -1).
+
+An element a + b i is a pair (a, b) of equally shaped arrays, uint64 for
+p < 2^32 (every product fits before reduction) and Python-int object
+arrays above that. All operations broadcast like NumPy ufuncs, so a whole
+row of a Cayley table, or a batch of Cipolla square roots, is one call.
+
+Example:
+    F = GFp2(7)                          # i^2 = -1
+    x = F.elements()                     # all 49 elements, code a*p + b
+    y = F.inv(F.elem(3, 2))              # (3 + 2i)^(-1)
+    F.codes(F.mul(x, y))                 # one row of the division table
+"""
+import random
+from typing import Optional, Tuple
+
+import numpy as np
+
+Pair = Tuple[np.ndarray, np.ndarray]
+
+
+def _is_nonresidue(d: int, p: int) -> bool:
+    return pow(d % p, (p - 1) // 2, p) == p - 1
+
+
+def least_nonresidue(p: int) -> int:
+    """Smallest quadratic non-residue mod the odd prime p (-1 if p ≡ 3 mod 4)."""
+    if p % 4 == 3:
+        return -1
+    return next(d for d in range(2, p) if _is_nonresidue(d, p))
+
+
+class GFp2:
+    """GF(p^2) as pairs (a, b) <-> a + b i with i^2 = d, d a non-residue mod p."""
+
+    def __init__(self, p: int, d: Optional[int] = None):
+        if p < 3 or p % 2 == 0:
+            raise ValueError("p must be an odd prime")
+        d = least_nonresidue(p) if d is None else d
+        if not _is_nonresidue(d, p):
+            raise ValueError(f"{d} is a square mod {p}; i^2 = {d} gives no field")
+        self.p, self.q = p, p * p
+        self.d = d                       # as given, for display
+        self.dtype = np.uint64 if p < 1 << 32 else object
+        scalar = np.uint64 if self.dtype is np.uint64 else int
+        self._p, self._d, self._two = scalar(p), scalar(d % p), scalar(2)
+
+    # ── encoding ──────────────────────────────────────────────────────
+    def elem(self, a, b=0) -> Pair:
+        """The pair (a mod p, b mod p) as arrays."""
+        p = self.p
+        a = np.asarray(np.asarray(a, dtype=object) % p, dtype=self.dtype)
+        b = np.asarray(np.asarray(b, dtype=object) % p, dtype=self.dtype)
+        return np.broadcast_arrays(a, b)
+
+    def from_codes(self, codes) -> Pair:
+        """Decode integers a*p + b (0 <= code < p^2) into pairs."""
+        codes = np.asarray(codes).astype(self.dtype)
+        return codes // self._p, codes % self._p
+
+    def codes(self, x: Pair) -> np.ndarray:
+        """Encode pairs as integers a*p + b."""
+        a, b = x
+        return a * self._p + b
+
+    def elements(self) -> Pair:
+        """All p^2 elements, a-major: (0,0), (0,1), ..., (p-1,p-1)."""
+        return self.from_codes(np.arange(self.q))
+
+    # ── arithmetic (elementwise, broadcasting) ────────────────────────
+    def _m(self, u, v):
+        """u * v mod p for arrays already reduced mod p."""
+        return (u * v) % self._p
+
+    def add(self, x: Pair, y: Pair) -> Pair:
+        p = self._p
+        return (x[0] + y[0]) % p, (x[1] + y[1]) % p
+
+    def neg(self, x: Pair) -> Pair:
+        p = self._p
+        return (p - x[0]) % p, (p - x[1]) % p
+
+    def sub(self, x: Pair, y: Pair) -> Pair:
+        return self.add(x, self.neg(y))
+
+    def mul(self, x: Pair, y: Pair) -> Pair:
+        """(a1 + b1 i)(a2 + b2 i) = (a1 a2 + d b1 b2) + (a1 b2 + a2 b1) i."""
+        p = self._p
+        a1, b1 = x
+        a2, b2 = y
+        real = (self._m(a1, a2) + self._m(self._m(b1, b2), self._d)) % p
+        imag = (self._m(a1, b2) + self._m(a2, b1)) % p
+        return real, imag
+
+    def sqr(self, x: Pair) -> Pair:
+        return self.mul(x, x)
+
+    def norm(self, x: Pair) -> np.ndarray:
+        """N(a + b i) = a^2 - d b^2 in GF(p) (= a^2 + b^2 when i^2 = -1)."""
+        p = self._p
+        a, b = x
+        return (self._m(a, a) + p - self._m(self._m(b, b), self._d)) % p
+
+    def trace(self, x: Pair) -> np.ndarray:
+        """Tr(a + b i) = 2a in GF(p)."""
+        return (x[0] * self._two) % self._p
+
+    def frobenius(self, x: Pair) -> Pair:
+        """x^p = a - b i (i^p = d^((p-1)/2) i = -i)."""
+        p = self._p
+        return x[0], (p - x[1]) % p
+
+    conj = frobenius
+
+    def _powmod(self, u: np.ndarray, e: int) -> np.ndarray:
+        """u^e mod p elementwise in GF(p)."""
+        result = np.ones_like(np.asarray(u, dtype=self.dtype))
+        while e:
+            if e & 1:
+                result = self._m(result, u)
+            u = self._m(u, u)
+            e >>= 1
+        return result
+
+    def inv(self, x: Pair) -> Pair:
+        """x^(-1) = conj(x) / N(x); raises ZeroDivisionError on any zero."""
+        n = self.norm(x)
+        if np.any(n == 0):
+            raise ZeroDivisionError("0 has no inverse in GF(p^2)")
+        n_inv = self._powmod(n, self.p - 2)
+        a, b = self.conj(x)
+        return self._m(a, n_inv), self._m(b, n_inv)
+
+    def div(self, x: Pair, y: Pair) -> Pair:
+        return self.mul(x, self.inv(y))
+
+    def pow(self, x: Pair, e: int) -> Pair:
+        """x^e by square-and-multiply (negative e inverts first)."""
+        if e < 0:
+            x, e = self.inv(x), -e
+        a, b = np.broadcast_arrays(*(np.asarray(v, dtype=self.dtype) for v in x))
+        result = (np.ones_like(a), np.zeros_like(b))
+        base = (a, b)
+        while e:
+            if e & 1:
+                result = self.mul(result, base)
+            base = self.sqr(base)
+            e >>= 1
+        return result
+
+    def __repr__(self) -> str:
+        return f"GFp2({self.p}, i^2 = {self.d})"
+
+
+def cipolla_sqrt(n: int, p: int, rng: Optional[random.Random] = None) -> int:
+    """
+    A square root of n modulo the odd prime p by Cipolla's algorithm.
+
+    Pick t with t^2 - n a non-residue; in GF(p)[w]/(w^2 - (t^2 - n)) the
+    element (t + w)^((p+1)/2) lies in GF(p) and squares to n.
+    Raises ValueError if n is not a square mod p.
+    """
+    n %= p
+    if n == 0:
+        return 0
+    if pow(n, (p - 1) // 2, p) != 1:
+        raise ValueError(f"{n} is not a quadratic residue mod {p}")
+    rng = rng or random.Random()
+    while True:
+        t = rng.randrange(p)
+        if _is_nonresidue(t * t - n, p):
+            break
+    F = GFp2(p, t * t - n)
+    root, _ = F.pow(F.elem(t, 1), (p + 1) // 2)
+    return int(root)
+
+
+if __name__ == "__main__":
+    import sys
+
+    p = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    F = GFp2(p)
+    codes = np.arange(1, F.q) if F.q <= 1 << 20 else np.random.randint(1, F.q, 1 << 20)
+    nz = F.from_codes(codes)
+    ok = np.all(F.codes(F.mul(nz, F.inv(nz))) == F.codes(F.elem(1)))
+    print(f"{F}: {len(codes)} nonzero x checked, x * x^-1 = 1 for all: {ok}")
+    print(f"sqrt(2) mod {p} by Cipolla:",
+          cipolla_sqrt(2, p) if pow(2, (p - 1) // 2, p) == 1 else "none")
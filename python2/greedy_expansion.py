@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+greedy_expansion.py
+
+Greedy binary expansion of a rational x in [0, 1):
+
+    x = sum_{k>=1} 2^-(m_1 + ... + m_k),    m_k = ceil(log2(1 / x_{k-1})),
+    x_k = 2^{m_k} x_{k-1} - 1,               x_0 = x.
+
+Every remainder has the denominator of x, so the state is one integer
+numerator a over the fixed d: m_k is the least m with a 2^m >= d (read
+off the bit lengths) and the step is a <- (a << m) - d. No Fraction, no
+gcd. The partial sum is the dyadic number whose bits are a 1 at each
+cumulative exponent, built once as a bytearray and read as one integer.
+
+An irrational x (a lazy_real.LazyReal such as "pi/4") has no numerator
+to iterate on, but its cumulative exponents are just the positions of the
+1 bits of x, so they are read off floor(x 2^B) for a certified B-bit
+prefix; B starts a little above 2n and grows until it holds n ones,
+giving up (the x looks dyadic) after MAX_IDLE_ROUNDS rounds without one.
+
+A float is dyadic, x = M 2^(e - 53) with the integer mantissa M from
+np.frexp, so its bits are shifts of M: float_bits reads k bits of a whole
+array of floats at once, exactly, and marks the rows where k runs past
+the 53 - e bits the float carries (the rest is zero padding, not more of
+the real number it approximates). float_exponents gives their exponents
+the same way, and truncation_bits is floor(x 2^k) for exact inputs.
+
+For batches, expansion_record turns one input line into a flat record
+(exponents, approximation, bits), iter_records maps it over many lines on
+a worker Pool (in input order), write_records emits JSONL or CSV/TSV, and
+exponent_summary collects the exponent histogram.
+
+Shared by Greedy_Binary_Expansions_Algorithm.py, code.py and 3.py.
+
+Example:
+    exps = binary_exponents(Fraction(5, 8), 10)      # [1, 2]
+    exps_to_bitstring(exps)                           # '101'
+    partial_binary_sum(exps)                          # Fraction(5, 8)
+    records = iter_records(open("xs.txt"), 64, workers=8)
+    write_records(records, sys.stdout, "jsonl")
+"""
+import csv
+import json
+from collections import Counter
+from decimal import Decimal
+from fractions import Fraction
+from math import isqrt
+from multiprocessing import Pool
+from numbers import Rational, Real
+from typing import Dict, Iterable, Iterator, List, TextIO, Tuple, Union
+
+import numpy as np
+
+from dyadic import DyadicBits, to_decimal
+from lazy_real import LazyReal, parse_real
+
+Record = Dict[str, object]
+ZERO_BITS = 256                 # a lazy x below 2^-256 is taken as 0
+MAX_IDLE_ROUNDS = 3             # rounds of >= 64 new bits without a 1 bit
+FLOAT_ROWS = 1 << 16            # floats per (rows, 53) bit window in float_exponents
+FIELDS = ("x", "n", "terms", "exponents", "approximation", "bits", "error")
+
+
+def parse_x(raw_x: str) -> Union[Fraction, LazyReal]:
+    """
+    Parse raw_x as one of:
+      - "a/b"           (Fraction)
+      - float literal  (e.g. "0.625")
+      - math expression (e.g. "pi/4", "e-2", "sqrt(2)-1"), kept exact as
+        a LazyReal and refined to whatever precision n needs
+    Return it in (0,1), reducing to the fractional part if ≥1.
+    """
+    try:
+        x = Fraction(raw_x)
+    except ValueError:
+        try:
+            x = parse_real(raw_x)
+        except Exception:
+            raise ValueError(f"could not parse x = {raw_x!r}")
+    if isinstance(x, LazyReal):
+        x -= x.floor()
+        if x.fixed(ZERO_BITS) == 0:        # 0 <= x < 2^-ZERO_BITS, certified
+            raise ValueError("x must lie strictly between 0 and 1 after fractional part")
+        return x
+    if x >= 1:
+        x -= x.numerator // x.denominator
+    if not (0 < x < 1):
+        raise ValueError("x must lie strictly between 0 and 1 after fractional part")
+    return x
+
+
+def _lazy_exponents(x: LazyReal, n: int) -> List[int]:
+    """The first n exponents of an irrational x, from the 1 bits of x."""
+    margin = 16 * isqrt(n) + 64           # ones in B bits: ~B/2 +- sqrt(B)/2
+    bits = 2 * n + margin
+    found = idle = 0
+    while True:
+        prefix = x.fixed(bits)
+        if not 0 <= prefix >> bits < 1:
+            raise ValueError("x must lie in [0, 1)")
+        text = format(prefix, f"0{bits}b").encode("ascii")
+        ones = np.flatnonzero(np.frombuffer(text, dtype=np.uint8) == 0x31)
+        if len(ones) >= n:
+            break
+        # a dyadic x (say "sqrt(1/4)") has no more 1 bits to find
+        idle = idle + 1 if len(ones) == found else 0
+        if idle >= MAX_IDLE_ROUNDS:
+            raise ValueError("x looks dyadic; pass it as a/b")
+        found = len(ones)
+        bits += 2 * (n - len(ones)) + margin
+    return np.diff(ones[:n] + 1, prepend=0).tolist()
+
+
+def binary_exponents(x: Union[Fraction, LazyReal], n: int) -> List[int]:
+    """
+    Compute up to n greedy-binary exponents m_k for x.
+    Stops early if the remainder becomes zero.
+    """
+    if n < 1:
+        raise ValueError("n must be at least 1")
+    if isinstance(x, LazyReal):
+        return _lazy_exponents(x, n)
+    if not 0 <= x < 1:
+        raise ValueError("x must lie in [0, 1)")
+
+    a, d = x.numerator, x.denominator      # rem = a / d, d never changes
+    d_bits = d.bit_length()
+    exps: List[int] = []
+    for _ in range(n):
+        if a == 0:
+            break
+        m = d_bits - a.bit_length()        # a << m has the bit length of d
+        if (a << m) < d:
+            m += 1
+        a = (a << m) - d
+        exps.append(m)
+    return exps
+
+
+def exps_to_bitstring(exps: List[int]) -> str:
+    """
+    Build the binary bitstring (after "0.") by placing (m_k–1) zeros
+    then a '1' for each exponent m_k, i.e. a 1 at each m1+…+mk.
+    """
+    bits = bytearray(b"0") * sum(exps)
+    pos = -1
+    for m in exps:
+        pos += m
+        bits[pos] = 0x31                   # '1'
+    return bits.decode("ascii")
+
+
+def partial_binary_sum(exps: List[int]) -> Fraction:
+    """
+    Given exponents [m1, m2, …], compute
+      sum_{k=1..len(exps)} 2^{-(m1+…+mk)}.
+    """
+    bits = exps_to_bitstring(exps)
+    if not bits:
+        return Fraction(0)
+    return DyadicBits(int(bits, 2), len(bits)).fraction()
+
+
+def float_bits(xs, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The first k bits after the point of every float in xs (all in [0, 1))
+    as a (len(xs), k) uint8 array, and a bool array marking the floats
+    with fewer than k significant places (53 - exponent).
+    """
+    xs = np.asarray(xs, dtype=np.float64).reshape(-1)
+    if not np.all((xs >= 0) & (xs < 1)):
+        raise ValueError("x must lie in [0, 1)")
+    mant, exp = np.frexp(xs)                       # x = mant 2^exp, mant in [1/2, 1)
+    mant = np.ldexp(mant, 53).astype(np.int64)     # exact: x = mant 2^(exp - 53)
+    places = 53 - exp.astype(np.int64)
+    shift = places[:, None] - np.arange(1, k + 1)  # bit i of x is bit places - i of mant
+    inside = (shift >= 0) & (shift < 53)
+    bits = (mant[:, None] >> np.where(inside, shift, 0)) & 1
+    return np.where(inside, bits, 0).astype(np.uint8), places < k
+
+
+def float_exponents(xs, n: int) -> List[List[int]]:
+    """binary_exponents of every float in xs; each list stops where the float's bits do."""
+    xs = np.asarray(xs, dtype=np.float64).reshape(-1)
+    if n < 1:
+        raise ValueError("n must be at least 1")
+    if not np.all((xs >= 0) & (xs < 1)):
+        raise ValueError("x must lie in [0, 1)")
+    # the 1 bits of x sit in the 53 places from its leading bit, 1 - exp,
+    # so a (rows, 53) window of mantissa bits covers any exponent
+    columns = np.arange(52, -1, -1, dtype=np.int64)
+    exps: List[List[int]] = []
+    for start in range(0, xs.size, FLOAT_ROWS):
+        mant, exp = np.frexp(xs[start:start + FLOAT_ROWS])
+        mant = np.ldexp(mant, 53).astype(np.int64)
+        rows, cols = np.nonzero(((mant[:, None] >> columns) & 1).astype(bool))
+        positions = cols + 1 - exp.astype(np.int64)[rows]
+        starts = np.searchsorted(rows, np.arange(mant.size))
+        gaps = np.diff(positions, prepend=0)
+        gaps[starts[starts < rows.size]] = positions[starts[starts < rows.size]]
+        keep = np.arange(rows.size) - starts[rows] < n         # the first n per row
+        counts = np.minimum(np.bincount(rows, minlength=mant.size), n)
+        flat, bounds = gaps[keep].tolist(), np.concatenate([[0], np.cumsum(counts)]).tolist()
+        exps.extend(flat[a:b] for a, b in zip(bounds[:-1], bounds[1:]))
+    return exps
+
+
+def truncation_bits(x: Union[Real, Decimal, LazyReal], k: int) -> List[int]:
+    """The first k bits of an exact x in [0, 1): floor(x 2^k) in big ints."""
+    if isinstance(x, LazyReal):
+        prefix = x.fixed(k)
+    else:
+        # Fraction takes ints, Fractions, floats and Decimals exactly; other
+        # reals (np.float32, ...) go through their exact float value
+        x = Fraction(x) if isinstance(x, (Rational, float, Decimal)) else Fraction(float(x))
+        prefix = (x.numerator << k) // x.denominator
+    if not 0 <= prefix >> k < 1:
+        raise ValueError("x must lie in [0, 1)")
+    return [int(c) for c in format(prefix, f"0{k}b")] if k else []
+
+
+def expansion_record(task: Tuple[str, int]) -> Record:
+    """The expansion of one (raw x, n) as a flat record; bad input gives "error"."""
+    raw_x, n = task
+    try:
+        exps = binary_exponents(parse_x(raw_x), n)
+    except (ValueError, ZeroDivisionError) as e:
+        return {"x": raw_x, "n": n, "error": str(e)}
+    approx = partial_binary_sum(exps)
+    return {
+        "x": raw_x,
+        "n": n,
+        "terms": len(exps),
+        "exponents": exps,
+        # Decimal has no 4300-digit str limit
+        "approximation": f"{to_decimal(approx.numerator)}/{to_decimal(approx.denominator)}",
+        "bits": "0." + exps_to_bitstring(exps),
+    }
+
+
+def iter_records(lines: Iterable[str], n: int, workers: int = 1,
+                 chunksize: int = 16) -> Iterator[Record]:
+    """expansion_record for every non-blank, non-# line, in input order."""
+    tasks = ((line.strip(), n) for line in lines
+             if line.strip() and not line.lstrip().startswith("#"))
+    if workers <= 1:
+        yield from map(expansion_record, tasks)
+        return
+    with Pool(workers) as pool:
+        yield from pool.imap(expansion_record, tasks, chunksize)
+
+
+def write_records(records: Iterable[Record], out: TextIO, fmt: str = "jsonl") -> int:
+    """Write records as JSONL, CSV or TSV (exponents space-separated); return the count."""
+    count = 0
+    if fmt == "jsonl":
+        for count, record in enumerate(records, 1):
+            out.write(json.dumps(record) + "\n")
+        return count
+    if fmt not in ("csv", "tsv"):
+        raise ValueError(f"unknown format {fmt!r}")
+    writer = csv.DictWriter(out, FIELDS, delimiter="," if fmt == "csv" else "\t")
+    writer.writeheader()
+    for count, record in enumerate(records, 1):
+        row = dict(record)
+        if "exponents" in row:
+            row["exponents"] = " ".join(map(str, row["exponents"]))
+        writer.writerow(row)
+    return count
+
+
+def exponent_summary(records: Iterable[Record]) -> Dict[str, object]:
+    """Counts over a batch: inputs, errors, early stops, and histograms of m_k and of max m_k."""
+    exponents: Counter = Counter()
+    largest: Counter = Counter()
+    inputs = errors = terminated = 0
+    for record in records:
+        inputs += 1
+        if "error" in record:
+            errors += 1
+            continue
+        exps = record["exponents"]
+        terminated += record["terms"] < record["n"]
+        exponents.update(exps)
+        if exps:
+            largest[max(exps)] += 1
+    return {"inputs": inputs, "errors": errors, "terminated": terminated,
+            "exponents": dict(sorted(exponents.items())),
+            "largest": dict(sorted(largest.items()))}
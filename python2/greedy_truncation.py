@@ -1,18 +1,26 @@
-def greedy_truncation(x: float, k: int) -> list:
+import warnings
+
+import numpy as np
+
+from greedy_expansion import float_bits, truncation_bits
+
+def greedy_truncation(x, k: int) -> list:
     """
     Return the first k bits of the greedy binary expansion of x in [0,1).
-    Each bit b_i is determined by multiplying x by 2 and extracting the integer part.
+    A float is read exactly off its mantissa and exponent (float_bits, a
+    shift of the np.frexp mantissa per bit); asking for more bits than it
+    carries warns, as those are only its zero padding. Fractions and lazy
+    reals such as parse_real("pi/4") go through exact big ints instead, as
+    do Decimals and other numbers.Real.
     """
-    if not (0 <= x < 1):
-        raise ValueError("Input x must be in the interval [0, 1).")
-    
-    bits = []
-    for _ in range(k):
-        x *= 2
-        bit = int(x)
-        bits.append(bit)
-        x -= bit
-    return bits
+    if isinstance(x, (float, np.floating)):
+        x = float(x)                       # exact, also for np.float32
+        bits, padded = float_bits([x], k)
+        if padded[0]:
+            warnings.warn(f"k = {k} exceeds the significant bits of x = {x!r}; "
+                          f"the tail is zero padding", stacklevel=2)
+        return bits[0].tolist()
+    return truncation_bits(x, k)
 
 # Examples
 print("N ->", greedy_truncation(1/2, 1))          # 1/2 in N -> [1]
@@ -1,35 +1,60 @@
-from sympy import symbols, Poly
-from sympy.polys.domains import GF
-from itertools import product
+from itertools import islice
+import random
+
+from sympy import symbols
+
+from gfp_poly import count_irreducible, iter_irreducible, random_irreducible
 
 def irreducible_polynomials(p, max_degree):
     """
     Return a dict mapping degree d to the list of all monic irreducible
     polynomials of degree d over GF(p), for 1 <= d <= max_degree.
+
+    This materialises O(p^d / d) SymPy Polys per degree; use
+    irreducible_counts / first_irreducibles / random_irreducibles when only
+    counts or a handful of moduli are needed.
     """
     x = symbols('x')
-    F = GF(p)
 
     irreducibles = {}
     for d in range(1, max_degree+1):
-        irreducibles[d] = []
-        # iterate over all possible coefficient tuples for x^(d-1)...x^0
-        for coeffs in product(range(p), repeat=d):
-            # build f(x) = x^d + coeffs[d-1]*x^(d-1) + ... + coeffs[0]
-            poly = Poly(x**d + sum(coeffs[i]*x**i for i in range(d)), x, domain=F)
-            if poly.is_irreducible:
-                irreducibles[d].append(poly)
+        # lexicographic scan, tested natively; only hits become SymPy Polys
+        irreducibles[d] = [f.to_sympy(x) for f in iter_irreducible(p, d)]
 
         print(f"Degree {d}: found {len(irreducibles[d])} irreducible polynomials")
 
     return irreducibles
 
+def irreducible_counts(p, max_degree):
+    """
+    Map degree d to the exact number of monic irreducible polynomials of
+    degree d over GF(p) (necklace formula), without enumerating any.
+    """
+    return {d: count_irreducible(p, d) for d in range(1, max_degree+1)}
+
+def first_irreducibles(p, d, k):
+    """The first k monic irreducibles of degree d in lexicographic order."""
+    x = symbols('x')
+    return [f.to_sympy(x) for f in islice(iter_irreducible(p, d), k)]
+
+def random_irreducibles(p, d, k, seed=None):
+    """k uniformly random monic irreducibles of degree d over GF(p)."""
+    x = symbols('x')
+    rng = random.Random(seed)
+    return [random_irreducible(p, d, rng).to_sympy(x) for _ in range(k)]
+
 if __name__ == "__main__":
     p = 3
-    max_deg = 15    # adjust as needed (degree 4: ~840 polynomials)
-    irr = irreducible_polynomials(p, max_deg)
+    max_deg = 15    # counts are exact and instant at any degree
+    for d, count in irreducible_counts(p, max_deg).items():
+        print(f"Degree {d}: {count} irreducible polynomials")
+
+    # Example: print all monic irreducible quadratics (lazily enumerated)
+    print(f"\nMonic irreducible quadratics over GF({p}):")
+    for q in first_irreducibles(p, 2, count_irreducible(p, 2)):
+        print("  ", q.as_expr())
 
-    # Example: print all monic irreducible quadratics
-    print("\nMonic irreducible quadratics over GF(7):")
-    for q in irr[2]:
+    # A few random moduli of the top degree, no enumeration needed
+    print(f"\nRandom irreducibles of degree {max_deg} over GF({p}):")
+    for q in random_irreducibles(p, max_deg, 3, seed=0):
         print("  ", q.as_expr())
@@ -1,33 +1,123 @@
-from random import randint
+"""
+pi_aoprox2.py
+
+Monte-Carlo "pi" in Z_modulus: the share of random points (x, y) with
+(x^2 + y^2) mod m <= r^2 mod m, times 4.
+
+Samples are drawn in fixed-size blocks of int64 arrays from NumPy's
+Generator, so memory stays at one block however many samples are taken
+(10^10 is ~10^4 blocks). Block i has its own stream,
+SeedSequence(seed, spawn_key=(i,)): streams are independent, and a run
+gives the same hits for a given seed whether its blocks go through one
+process or a Pool of workers. After every block the running estimate
+comes with its standard error 4 sqrt(p (1 - p) / n), and a run can stop
+once that is below a target.
+
+Example:
+    modular_pi_approximation(65537, 10000, 10 ** 6, seed=1)
+    modular_pi_approximation(65537, 10000, 10 ** 10, seed=1, workers=8,
+                             target_se=1e-5)
+    for n, hits, estimate, se in iter_estimates(65537, 10000, 10 ** 8):
+        ...
+"""
 from fractions import Fraction
+from math import sqrt
+from multiprocessing import Pool
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+BLOCK = 1 << 20                 # samples per block (and per stream)
+MAX_MODULUS = 1 << 31           # x^2 + y^2 must fit in int64
+
+
+def standard_error(estimate: float, n: int) -> float:
+    """Standard error of 4 * hits / n: 4 sqrt(p (1 - p) / n) with p = estimate / 4."""
+    return sqrt(max(estimate * (4 - estimate), 0.0) / n)
+
+
+def _block_hits(task: Tuple[int, int, int, int, int]) -> Tuple[int, int]:
+    """(size, hits) of one block drawn from its own stream."""
+    entropy, index, modulus, threshold, size = task
+    rng = np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=(index,)))
+    x = rng.integers(0, modulus, size, dtype=np.int64)
+    y = rng.integers(0, modulus, size, dtype=np.int64)
+    x *= x
+    y *= y
+    x += y
+    x %= modulus
+    return size, int(np.count_nonzero(x <= threshold))
+
+
+class _Serial:
+    """Stand-in for Pool when workers == 1."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    @staticmethod
+    def imap(func, iterable):
+        return map(func, iterable)
+
+
+def iter_estimates(modulus: int, radius: int, samples: int,
+                   seed: Optional[int] = None, workers: int = 1,
+                   block: int = BLOCK) -> Iterator[Tuple[int, int, float, float]]:
+    """Yield (n, hits, 4 hits / n, standard error) after every block."""
+    if not 1 <= modulus <= MAX_MODULUS:
+        raise ValueError(f"modulus must be in [1, {MAX_MODULUS}]")
+    entropy = np.random.SeedSequence(seed).entropy
+    threshold = radius * radius % modulus
+    tasks = ((entropy, i, modulus, threshold, min(block, samples - i * block))
+             for i in range(-(-samples // block)))
+    n = hits = 0
+    with Pool(workers) if workers > 1 else _Serial() as pool:
+        for size, h in pool.imap(_block_hits, tasks):
+            n += size
+            hits += h
+            estimate = 4 * hits / n
+            yield n, hits, estimate, standard_error(estimate, n)
+
+
+def _clamped(hits: int, n: int) -> Fraction:
+    """4 hits / n as a Fraction, clamped to [3, 4]."""
+    approx_pi = Fraction(hits, n) * 4
 
-def modular_pi_approximation(modulus, radius, samples):
-    inside_circle = 0
-    
-    for _ in range(samples):
-        # Random point (x, y) in Z_modulus
-        x = randint(0, modulus - 1)
-        y = randint(0, modulus - 1)
-        
-        # Check if the point is inside the circle
-        if (x**2 + y**2) % modulus <= radius**2 % modulus:
-            inside_circle += 1
-    
-    # Fractional approximation of pi
-    approx_pi = Fraction(inside_circle, samples) * 4
-    
     # Ensure the result lies between 3 and 4
     if approx_pi < 3:
         approx_pi = Fraction(3, 1)
     elif approx_pi > 4:
         approx_pi = Fraction(4, 1)
-    
+
     return approx_pi
 
-# Parameters
-modulus = 65537  # Z_65537
-radius = 10000   # Choose a suitable radius
-samples = 100000 # Number of random samples
 
-approximation = modular_pi_approximation(modulus, radius, samples)
-print(f"Approximation of pi in Z_{modulus} as fraction (between 3 and 4): {approximation}")
+def modular_pi_approximation(modulus, radius, samples, seed=None, workers=1,
+                             target_se=None):
+    """
+    4 * (share of points inside) as a Fraction, clamped to [3, 4]. With
+    target_se, stops after the first block whose standard error is below
+    it; a standard error of 0 (no hits or all hits so far) never stops it.
+    """
+    n = inside_circle = 0
+    for n, inside_circle, _, se in iter_estimates(modulus, radius, samples, seed, workers):
+        if target_se is not None and 0 < se <= target_se:
+            break
+    if n == 0:
+        raise ValueError("samples must be positive")
+    return _clamped(inside_circle, n)
+
+
+if __name__ == "__main__":
+    # Parameters
+    modulus = 65537  # Z_65537
+    radius = 10000   # Choose a suitable radius
+    samples = 100000 # Number of random samples
+
+    for n, hits, estimate, se in iter_estimates(modulus, radius, samples):
+        pass
+    print(f"Approximation of pi in Z_{modulus} as fraction (between 3 and 4): {_clamped(hits, n)}")
+    print(f"Unclamped estimate: {estimate:.6g}   standard error: {se:.2g}")
@@ -1,24 +1,24 @@
 import math
+from itertools import islice
+
+from archimedes import iter_bounds
 
 def pi_archimedes(n):
     """
     Calculate n iterations of Archimedes PI recurrence relation
+    (half-angle form, see archimedes.py: no cancellation as n grows)
     """
-    polygon_edge_length_squared = 2.0
-    polygon_sides = 4
-    for i in range(n):
-        polygon_edge_length_squared = 2 - 2 * math.sqrt(1 - polygon_edge_length_squared / 4)
-        polygon_sides *= 2
-    return polygon_sides * math.sqrt(polygon_edge_length_squared) / 2
+    _, result, _ = next(islice(iter_bounds(2.0, 4), n, None))
+    return result
 
 def main():
     """
     Try the series
     """
-    for n in range(16):
-        result = pi_archimedes(n)
+    # one pass over the doublings instead of a rerun per n
+    for n, result, _ in islice(iter_bounds(2.0, 4), 16):
         error = result - math.pi
         print("%8d iterations %.10f error %.10f" % (n, result, error))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,30 +1,30 @@
 from decimal import Decimal, getcontext
+from itertools import islice
+
+from archimedes import digits, iter_bounds, iter_decimal
 
 def pi_archimedes(n):
     """
     Calculate n iterations of Archimedes PI recurrence relation
+    (half-angle form at the current precision, see archimedes.py)
     """
-    polygon_edge_length_squared = Decimal(2)
-    polygon_sides = 2
-    for i in range(n):
-        polygon_edge_length_squared = 2 - 2 * (1 - polygon_edge_length_squared / 4).sqrt()
-        polygon_sides *= 2
-    return polygon_sides * polygon_edge_length_squared.sqrt()
+    _, result, _ = next(islice(iter_bounds(Decimal(2), 4, Decimal.sqrt), n, None))
+    return result
 
 def main():
     """
     Try the series
     """
     places = 100
-    old_result = None
-    for n in range(10*places):
-        # Do calculations with double precision
-        getcontext().prec = 2*places
-        result = pi_archimedes(n)
+    # Successive polygons in one pass, at places + a few guard digits
+    for n, lo, hi in iter_decimal(places):
         # Print the result with single precision
         getcontext().prec = places
-        result = +result           # do the rounding on result
+        result = +lo               # do the rounding on result
         print("%3d: %s" % (n, result))
-        if result == old_result:
+        # lo < pi < hi: stop once the bracket fixes every printed digit
+        if digits(lo, hi) >= places:
             break
-        old_result = result
\ No newline at end of file
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,172 @@
-import math
-from sympy import primerange
+"""
+pi_conjecture_verifier.py
+
+Find the first prime p (and least k < p) for which (3p + 2k)/(p + 1),
+rounded to n decimals, shows the first n decimals of pi.
+
+With T = I * 10^n + D (D the n target digits, I the integer part the
+rounding gives) the condition is
+
+    (2T - 1)(p + 1)  <=  2 * 10^n (3p + 2k)  <=  (2T + 1)(p + 1),
+
+an interval for k solved exactly in integers: O(1) per prime and I
+(k_range). Ties round half-even, so the ends count only for even T.
+verify_conjecture streams primes from a segmented sieve and stops at the
+first prime with a non-empty range, which is fine up to ~10^8.
+
+The first hit lies near p ~ 10^(n/2), too far to sieve for 20+ digits.
+stern_brocot_search instead walks the Stern-Brocot tree for the reduced
+fractions a/b in the target window J = (D -+ 1/2) / 10^n in order of b.
+Only multiples of those b can be p + 1, so it tests just a handful of
+candidates with isprime and k_range.
+"""
+import heapq
+from decimal import Decimal, localcontext
+from fractions import Fraction
+from math import isqrt
+from typing import Iterator, List, Optional, Tuple
+
+from sympy import isprime
+
+from constants import decimal
+
+Solution = Tuple[Optional[int], Optional[int], Optional[Fraction]]
+
 
 def get_pi_digits(n):
     """Get the first n digits of the decimal part of pi."""
-    # Convert pi to string and split at the decimal point
-    pi_decimal = str(math.pi).split('.')[1]
-    return pi_decimal[:n]
-
-def verify_conjecture(pi_digits, n):
-    """Find the first prime p and corresponding k that satisfy the conjecture."""
-    for p in primerange(2, 90000):         # iterate primes up to a limit
-        for k in range(p):                 # iterate k < p
-            fraction = (3 * p + 2 * k) / (p + 1)
-            # Format with n decimals, split off integer part
-            fraction_str = f"{fraction:.{n}f}".split('.')[1]
-            if fraction_str == pi_digits:
-                return p, k, fraction
+    # arbitrary precision (constants.py), not the 15 digits of str(math.pi)
+    return str(decimal("pi", n)).split('.')[1][:n]
+
+
+def iter_primes(limit: int, segment: int = 1 << 16) -> Iterator[int]:
+    """Primes below limit, in order, from a segmented sieve of Eratosthenes."""
+    small = bytearray([1]) * (isqrt(limit) + 1)
+    small[:2] = b"\x00\x00"
+    for i in range(2, isqrt(len(small) - 1) + 1):
+        if small[i]:
+            small[i * i::i] = bytearray(len(small[i * i::i]))
+    base = [i for i, flag in enumerate(small) if flag]
+    for lo in range(2, limit, segment):
+        hi = min(lo + segment, limit)
+        seg = bytearray([1]) * (hi - lo)
+        for q in base:
+            if q * q >= hi:
+                break
+            start = max(q * q, -(-lo // q) * q)
+            seg[start - lo::q] = bytearray(len(seg[start - lo::q]))
+        for i, flag in enumerate(seg):
+            if flag:
+                yield lo + i
+
+
+def k_range(p: int, digits: str) -> Optional[Tuple[int, int]]:
+    """
+    The admissible k of the smallest rounded integer part I, as (k_lo, k_hi)
+    with 0 <= k_lo <= k_hi < p, or None if no k < p works for this p.
+    """
+    n, D = len(digits), int(digits)
+    scale = 10 ** n
+    S = 4 * scale
+    for I in range(1, 6):              # 3p/(p+1) <= x < 5
+        T = I * scale + D
+        L = (2 * T - 1) * (p + 1) - 6 * p * scale
+        R = (2 * T + 1) * (p + 1) - 6 * p * scale
+        k_lo, k_hi = -(-L // S), R // S
+        if T % 2:                      # odd T: the ties round away from T
+            k_lo += L % S == 0
+            k_hi -= R % S == 0
+        k_lo, k_hi = max(k_lo, 0), min(k_hi, p - 1)
+        if k_lo <= k_hi:
+            return k_lo, k_hi
+    return None
+
+
+def _solution(p: int, k: int) -> Solution:
+    return p, k, Fraction(3 * p + 2 * k, p + 1)
+
+
+def verify_conjecture(pi_digits, n, limit=90000):
+    """Find the first prime p < limit and corresponding k that satisfy the conjecture."""
+    digits = pi_digits[:n]
+    for p in iter_primes(limit):
+        ks = k_range(p, digits)
+        if ks is not None:
+            return _solution(p, ks[0])
     return None, None, None  # no solution found
 
+
+def _window(digits: str) -> Tuple[Fraction, Fraction, bool]:
+    """J = [lo, hi] holding x - I for every admissible x; closed iff D is even."""
+    n, D = len(digits), int(digits)
+    return Fraction(2 * D - 1, 2 * 10 ** n), Fraction(2 * D + 1, 2 * 10 ** n), D % 2 == 0
+
+
+def iter_window_fractions(lo: Fraction, hi: Fraction,
+                          closed: bool) -> Iterator[Tuple[int, int]]:
+    """Reduced fractions a/b in the window, by increasing b (Stern-Brocot order)."""
+    def inside(a: int, b: int) -> bool:
+        x = Fraction(a, b)
+        return lo <= x <= hi if closed else lo < x < hi
+
+    heap: List[Tuple[int, int, int, int, int]] = []
+    for g in range(lo.numerator // lo.denominator, hi.numerator // hi.denominator + 1):
+        if inside(g, 1):
+            yield g, 1
+        heap.append((1 + 1, g, 1, g + 1, 1))        # subtree of (g, g + 1)
+    heapq.heapify(heap)
+    while heap:
+        b, a1, b1, a2, b2 = heapq.heappop(heap)
+        a = a1 + a2
+        if inside(a, b):
+            yield a, b
+        m = Fraction(a, b)
+        if Fraction(a1, b1) < hi and m > lo:
+            heapq.heappush(heap, (b1 + b, a1, b1, a, b))
+        if m < hi and Fraction(a2, b2) > lo:
+            heapq.heappush(heap, (b + b2, a, b, a2, b2))
+
+
+def stern_brocot_search(pi_digits, n, limit=None):
+    """
+    verify_conjecture without enumerating primes: p + 1 must be a multiple
+    of the denominator of some reduced fraction in the window, so only
+    those multiples are tried, smallest first.
+    """
+    digits = pi_digits[:n]
+    fractions = iter_window_fractions(*_window(digits))
+    next_b = next(fractions)[1]
+    multiples: List[Tuple[int, int]] = []          # (m * b, b)
+    last = 0
+    while True:
+        while next_b is not None and (not multiples or next_b <= multiples[0][0]):
+            heapq.heappush(multiples, (next_b, next_b))
+            next_b = next(fractions, (None, None))[1]
+        b, base = heapq.heappop(multiples)
+        heapq.heappush(multiples, (b + base, base))
+        if limit is not None and b - 1 >= limit:
+            return None, None, None
+        if b == last:
+            continue
+        last = b
+        p = b - 1
+        if p >= 2 and isprime(p):
+            ks = k_range(p, digits)
+            if ks is not None:
+                return _solution(p, ks[0])
+
+
 if __name__ == "__main__":
     n = int(input("Enter the number of digits of pi to consider: "))
     pi_digits = get_pi_digits(n)
-    p, k, fraction = verify_conjecture(pi_digits, n)
+    p, k, fraction = stern_brocot_search(pi_digits, n)
 
     if p is not None:
         print(f"Prime p: {p}")
         print(f"Integer k: {k}")
-        print(f"Corresponding fraction: {fraction}")
+        with localcontext() as ctx:
+            ctx.prec = n + 10
+            value = Decimal(fraction.numerator) / fraction.denominator
+        print(f"Corresponding fraction: {fraction} = {value:.{n + 2}f}...")
     else:
         print("No solution found.")
@@ -1,13 +1,19 @@
 #!/usr/bin/env python3
 """
-Generate the quadratic extension GF(p^2) = GF(p)[i]/(i^2 + 1)
-for a prime p ≡ 3 mod 4, and emit TeX tables for addition
-and multiplication in that field.
+Generate the quadratic extension GF(p^2) = GF(p)[i]/(i^2 - d) for an odd
+prime p, and emit TeX tables for addition and multiplication in that field.
+For p ≡ 3 mod 4, d = -1 (the usual i^2 = -1); otherwise d is the least
+quadratic non-residue mod p.
 """
 
 import sys
+
+import numpy as np
 from sympy import isprime
 
+from gfp2 import GFp2
+from latex_tables import label_lookup, write_cayley_table
+
 def repr_elem(elem):
     """
     Return a TeX‐friendly string for the field element a + b i.
@@ -21,70 +27,51 @@ def repr_elem(elem):
         return f"{a} + i"
     return f"{a} + {b}i"
 
-def generate_tables(p):
+def generate_tables(p, out=sys.stdout, **layout):
+    """
+    Write the addition and multiplication tables of GF(p^2) to `out`.
+    Layout options (tile_cols, tile_rows, longtable, block_rows) go to
+    latex_tables.write_table.
+    """
     # 1) Check primality
     if not isprime(p):
         sys.exit(f"Error: {p} is not prime.")
-    # 2) Check that –1 is a nonresidue, i.e. p ≡ 3 mod 4
-    if p % 4 != 3:
-        sys.exit(f"Error: –1 is a square in GF({p}); choose p ≡ 3 mod 4.")
+    if p == 2:
+        sys.exit("Error: p must be odd.")
+    # 2) i^2 = d for a nonresidue d (-1 when p ≡ 3 mod 4)
+    F = GFp2(p)
+
+    # 3) Field elements a+bi are encoded as a*p + b, in the order
+    #    (a, b) for a in range(p) for b in range(p); names computed once
+    elements = np.arange(p * p)
+    label = label_lookup([f"${repr_elem(divmod(e, p))}$" for e in range(p * p)])
+
+    # 4) Vectorised operations on codes, evaluated one block of rows at a
+    #    time by the table writer (no p^2 x p^2 table is ever built)
+    def add(u, v):
+        return F.codes(F.add(F.from_codes(u), F.from_codes(v)))
 
-    # 3) Build the list of field elements (a,b) for a+bi
-    elements = [(a, b) for a in range(p) for b in range(p)]
-    names = [repr_elem(e) for e in elements]
+    def mul(u, v):
+        return F.codes(F.mul(F.from_codes(u), F.from_codes(v)))
 
-    # 4) Precompute addition and multiplication tables
-    #    i^2 = -1 ≡ p−1 modulo p
-    add_table = [
-        [((a1 + a2) % p, (b1 + b2) % p)
-         for (a2, b2) in elements]
-        for (a1, b1) in elements
-    ]
-    mul_table = [
-        [(
-            (a1 * a2 + (p - 1) * b1 * b2) % p,
-            (a1 * b2 + a2 * b1) % p
-         )
-         for (a2, b2) in elements]
-        for (a1, b1) in elements
-    ]
+    field = f"$\\GF({p}^2)$"
+    if F.d != -1:
+        field += f", $i^2 = {F.d}$"
 
     # 5) Emit TeX for the addition table
-    print(r"\begin{table}[ht]")
-    print(r"  \centering")
-    print(f"  \\caption{{Addition in $\\GF({p}^2)$}}")
-    print(r"  \begin{tabular}{r|" + "c" * len(elements) + "}")
-    # header row
-    header = " & ".join(f"${n}$" for n in names)
-    print(r"    $+$ & " + header + r" \\ \hline")
-    # data rows
-    for i, row_name in enumerate(names):
-        row_entries = " & ".join(f"${repr_elem(add_table[i][j])}$"
-                                 for j in range(len(elements)))
-        print(f"    ${row_name}$ & {row_entries} \\\\")
-    print(r"  \end{tabular}")
-    print(r"\end{table}")
-    print()  # blank line between tables
+    write_cayley_table(out, add, elements, label, "$+$", first_col="r",
+                       caption=f"Addition in {field}", **layout)
+    out.write("\n")  # blank line between tables
 
     # 6) Emit TeX for the multiplication table
-    print(r"\begin{table}[ht]")
-    print(r"  \centering")
-    print(f"  \\caption{{Multiplication in $\\GF({p}^2)$}}")
-    print(r"  \begin{tabular}{r|" + "c" * len(elements) + "}")
-    # header row
-    print(r"    $\times$ & " + header + r" \\ \hline")
-    # data rows
-    for i, row_name in enumerate(names):
-        row_entries = " & ".join(f"${repr_elem(mul_table[i][j])}$"
-                                 for j in range(len(elements)))
-        print(f"    ${row_name}$ & {row_entries} \\\\")
-    print(r"  \end{tabular}")
-    print(r"\end{table}")
+    write_cayley_table(out, mul, elements, label, "$\\times$", first_col="r",
+                       caption=f"Multiplication in {field}", **layout)
+    out.flush()
 
 
 if __name__ == "__main__":
     try:
-        p = int(input("Enter an odd prime p ≡ 3 mod 4: ").strip())
+        p = int(input("Enter an odd prime p: ").strip())
     except ValueError:
         sys.exit("Error: please enter a valid integer.")
     generate_tables(p)
@@ -0,0 +1,187 @@
+"""
+symbol_index.py
+
+The inverse of legendre.py: given the symbols (m n^-1 | p) of an element
+of the ultraproduct at the first K primes, which rationals m/n of small
+height max(|m|, n) have exactly those symbols?
+
+The index holds every reduced m/n up to a height H, keyed by a 64-bit
+hash of its signature (the primes where the symbol is -1 and where it is
+0, as two K-bit masks, K <= 64). Its arrays, sorted by key, live on disk
+under SYMBOL_INDEX_CACHE (default ~/.cache/myfiles/symbol_index), one
+file per K. extend(H') adds only the heights above H, so the index grows
+as queries need it. The symbols themselves come from per-prime tables of
+Legendre symbols, (m n^-1 | p) = L_p[m mod p] L_p[n mod p], one NumPy
+gather per prime for a whole block of rationals. A lookup is a binary
+search, and the candidates are re-checked against the full vector to
+rule out hash collisions.
+
+Example:
+    index = SymbolIndex.load(32)
+    index.extend(2000)                       # ~4.9 * 10^6 rationals
+    primes, symbols = legendre_symbols(Fraction(355, 113), index.primes[-1])
+    index.lookup(symbols)                    # [Fraction(355, 113), ...]
+"""
+import os
+import tempfile
+from fractions import Fraction
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from legendre import small_primes
+
+CACHE_DIR = os.environ.get(
+    "SYMBOL_INDEX_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "myfiles", "symbol_index"))
+MAX_K = 64
+ROWS = 1 << 20                  # rationals hashed per block
+_MIX = (np.uint64(0x9E3779B97F4A7C15), np.uint64(0xC2B2AE3D27D4EB4F))
+
+Symbols = Union[Sequence[int], np.ndarray, Dict[int, int]]
+
+
+def first_primes(k: int) -> np.ndarray:
+    """The first k primes."""
+    limit = 16
+    while True:
+        primes = small_primes(limit)
+        if len(primes) >= k:
+            return primes[:k]
+        limit *= 2
+
+
+def legendre_tables(primes: np.ndarray) -> List[np.ndarray]:
+    """L_p[r] for r mod p: the Legendre symbol, and r itself for p = 2 (as pow() gives)."""
+    tables = []
+    for p in primes.tolist():
+        if p == 2:
+            tables.append(np.array([0, 1], dtype=np.int8))
+            continue
+        table = np.full(p, -1, dtype=np.int8)
+        table[np.arange(1, p, dtype=np.int64) ** 2 % p] = 1
+        table[0] = 0
+        tables.append(table)
+    return tables
+
+
+def _hash(negative: np.ndarray, zero: np.ndarray) -> np.ndarray:
+    return negative * _MIX[0] ^ zero * _MIX[1]
+
+
+def signature_keys(m: np.ndarray, n: np.ndarray, primes: np.ndarray,
+                   tables: List[np.ndarray]) -> np.ndarray:
+    """The hashed signature of every m/n over the given primes."""
+    negative = np.zeros(m.shape, dtype=np.uint64)
+    zero = np.zeros(m.shape, dtype=np.uint64)
+    for i, (p, table) in enumerate(zip(primes.tolist(), tables)):
+        s = table[m % p] * table[n % p]
+        negative |= (s < 0).astype(np.uint64) << np.uint64(i)
+        zero |= (s == 0).astype(np.uint64) << np.uint64(i)
+    return _hash(negative, zero)
+
+
+def _rationals(low: int, high: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduced m/n with low < max(|m|, n) <= high, by rows of n."""
+    ms, ns = [], []
+    full = np.arange(-high, high + 1, dtype=np.int64)
+    shell = np.concatenate([np.arange(-high, -low, dtype=np.int64),
+                            np.arange(low + 1, high + 1, dtype=np.int64)])
+    for n in range(1, high + 1):
+        m = full if n > low else shell
+        m = m[np.gcd(m, n) == 1]
+        ms.append(m)
+        ns.append(np.full(m.shape, n, dtype=np.int64))
+    if not ms:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    return np.concatenate(ms), np.concatenate(ns)
+
+
+class SymbolIndex:
+    """Reduced rationals of height <= height, sorted by signature hash over the first k primes."""
+
+    def __init__(self, k: int, height: int = 0, keys=None, num=None, den=None):
+        if not 1 <= k <= MAX_K:
+            raise ValueError(f"k must be in [1, {MAX_K}]")
+        self.k, self.height = k, height
+        self.primes = first_primes(k)
+        self._tables = legendre_tables(self.primes)
+        self.keys = np.empty(0, np.uint64) if keys is None else keys
+        self.num = np.empty(0, np.int32) if num is None else num
+        self.den = np.empty(0, np.int32) if den is None else den
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    # ── disk ──────────────────────────────────────────────────────────
+    @staticmethod
+    def path(k: int) -> str:
+        return os.path.join(CACHE_DIR, f"k{k}.npz")
+
+    @classmethod
+    def load(cls, k: int) -> "SymbolIndex":
+        """The stored index for k, or an empty one."""
+        try:
+            with np.load(cls.path(k)) as data:
+                return cls(k, int(data["height"]), data["keys"], data["num"], data["den"])
+        except (OSError, KeyError, ValueError):
+            return cls(k)
+
+    def save(self) -> None:
+        """Atomically replace the stored index; an unwritable cache is not an error."""
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+            with os.fdopen(fd, "wb") as fh:
+                np.savez(fh, height=self.height, keys=self.keys, num=self.num, den=self.den)
+            os.replace(tmp, self.path(self.k))
+        except OSError:
+            pass
+
+    # ── building ──────────────────────────────────────────────────────
+    def extend(self, height: int, save: bool = True) -> "SymbolIndex":
+        """Add every reduced m/n with self.height < max(|m|, n) <= height."""
+        if height <= self.height:
+            return self
+        if height >= 1 << 31:
+            raise ValueError("height must fit in int32")
+        m, n = _rationals(self.height, height)
+        keys = np.concatenate([signature_keys(m[i:i + ROWS], n[i:i + ROWS],
+                                              self.primes, self._tables)
+                               for i in range(0, len(m), ROWS)] or [np.empty(0, np.uint64)])
+        keys = np.concatenate([self.keys, keys])
+        order = np.argsort(keys, kind="stable")     # stable: old (lower) heights first
+        self.keys = keys[order]
+        self.num = np.concatenate([self.num, m.astype(np.int32)])[order]
+        self.den = np.concatenate([self.den, n.astype(np.int32)])[order]
+        self.height = height
+        if save:
+            self.save()
+        return self
+
+    # ── queries ───────────────────────────────────────────────────────
+    def _vector(self, symbols: Symbols) -> np.ndarray:
+        if isinstance(symbols, dict):
+            symbols = [symbols[p] for p in self.primes.tolist()]
+        vector = np.asarray(symbols, dtype=np.int8)[:self.k]
+        if len(vector) < self.k:
+            raise ValueError(f"need the symbols at the first {self.k} primes")
+        return vector
+
+    def lookup(self, symbols: Symbols, limit: Optional[int] = None) -> List[Fraction]:
+        """Rationals in the index whose symbols at the first k primes are `symbols`, by height."""
+        vector = self._vector(symbols)
+        negative = sum(1 << i for i, s in enumerate(vector.tolist()) if s < 0)
+        zero = sum(1 << i for i, s in enumerate(vector.tolist()) if s == 0)
+        key = _hash(np.array([negative], np.uint64), np.array([zero], np.uint64))[0]
+        lo = np.searchsorted(self.keys, key, side="left")
+        hi = np.searchsorted(self.keys, key, side="right")
+        m = self.num[lo:hi].astype(np.int64)
+        n = self.den[lo:hi].astype(np.int64)
+        exact = np.ones(len(m), dtype=bool)            # rule out hash collisions
+        for s, p, table in zip(vector.tolist(), self.primes.tolist(), self._tables):
+            exact &= table[m % p] * table[n % p] == s
+        m, n = m[exact], n[exact]
+        order = np.lexsort((np.abs(m), n, np.maximum(np.abs(m), n)))
+        found = [Fraction(int(a), int(b)) for a, b in zip(m[order], n[order])]
+        return found if limit is None else found[:limit]